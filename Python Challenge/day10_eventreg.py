@@ -1,18 +1,34 @@
 import streamlit as st
 import pandas as pd
-import io
+import os
+from functools import partial
+from day10_store import COLUMNS, CONFIRMED, EVENTS, SORT_COLUMNS, create_store
+from day10_export import EXPORT_FORMATS, export_registrations
+from day10_import import import_registrations, is_valid_email, read_upload
 
 st.set_page_config(page_title="Event Registration System 🎉", layout="wide")
 
-# Initialize session storage
-if "registrations" not in st.session_state:
-    st.session_state.registrations = []
+# Shared storage (one store for every session on this server)
+@st.cache_resource
+def get_store():
+    return create_store()
+
+store = get_store()
+
+def read_file(path):
+    """A file's bytes; handed to download buttons so it's only read on click"""
+    with open(path, "rb") as f:
+        return f.read()
 
 st.title("🎉 Event Registration System")
 
 # Tabs for User & Admin
 tabs = st.tabs(["📝 Register", "📊 Admin Panel"])
 
+# Last export built by this session (file path + format)
+if "export" not in st.session_state:
+    st.session_state.export = None
+
 # ================== USER REGISTRATION ==================
 with tabs[0]:
     st.header("Register for an Event")
@@ -21,23 +37,33 @@ with tabs[0]:
     with st.form("registration_form"):
         name = st.text_input("Full Name")
         email = st.text_input("Email")
-        event_choice = st.radio("Choose Event", ["Morning", "Afternoon", "Evening"])
+        seats = store.seat_counts()
+        event_choice = st.radio(
+            "Choose Event",
+            EVENTS,
+            format_func=lambda e: f"{e} ({max(seats[e][2] - seats[e][0], 0)} seats left)",
+        )
         submit = st.form_submit_button("Register ✅")
 
     if submit:
         if not name or not email:
             st.warning("⚠️ Please provide both name and email.")
+        elif not is_valid_email(email):
+            st.warning("⚠️ Please provide a valid email address.")
+        elif store.is_registered(email, event_choice):
+            st.warning(f"⚠️ {email} is already registered for the {event_choice} event.")
         else:
-            # Save registration
-            st.session_state.registrations.append({
-                "Name": name,
-                "Email": email,
-                "Event": event_choice
-            })
-            st.success(f"🎉 Thank you {name}! You have registered for the {event_choice} event.")
+            status = store.add(name.strip(), email.strip(), event_choice)
+            if status == CONFIRMED:
+                st.success(f"🎉 Thank you {name}! You have registered for the {event_choice} event.")
+            elif status:
+                st.info(f"⏳ The {event_choice} event is full, {name}. You're on the waitlist and will get the next free seat.")
+            else:
+                # Another session registered the same email+event a moment ago
+                st.warning(f"⚠️ {email} is already registered for the {event_choice} event.")
 
     # Show current total
-    st.metric("Total Registrations", len(st.session_state.registrations))
+    st.metric("Total Registrations", store.count())
 
 
 # ================== ADMIN PANEL ==================
@@ -45,25 +71,117 @@ with tabs[1]:
     st.header("📊 Admin Panel")
     st.write("Here you can view registrations and download them as CSV.")
 
-    if len(st.session_state.registrations) == 0:
+    # Seats per event
+    seat_cols = st.columns(len(EVENTS))
+    for col, (event, (confirmed, waitlisted, capacity)) in zip(seat_cols, store.seat_counts().items()):
+        col.metric(f"{event} seats", f"{confirmed}/{capacity}", f"{waitlisted} waitlisted", delta_color="off")
+
+    with st.expander("🪑 Event Capacities"):
+        with st.form("capacity_form"):
+            new_capacities = {
+                event: st.number_input(f"{event} seats", min_value=0, value=store.capacity(event), step=1)
+                for event in EVENTS
+            }
+            if st.form_submit_button("💾 Save Capacities"):
+                for event, seats in new_capacities.items():
+                    if seats != store.capacity(event):
+                        store.set_capacity(event, int(seats))
+                st.success("Capacities saved. Waitlisted registrations were moved into any new seats.")
+
+    # Bulk import from partner systems
+    with st.expander("📤 Bulk Import (CSV / JSONL)"):
+        st.caption("Files need Name, Email and Event columns.")
+        upload = st.file_uploader("Registrations file", type=["csv", "jsonl", "ndjson"])
+        if upload is not None and st.button("📤 Import Registrations"):
+            try:
+                report = import_registrations(store, read_upload(upload, upload.name))
+            except ValueError as e:
+                st.error(f"⚠️ {e}")
+            else:
+                st.success(
+                    f"Imported {report['inserted']} of {report['rows_read']} rows in "
+                    f"{report['seconds']:.2f}s ({report['rows_per_second']:,.0f} rows/s). "
+                    f"Invalid: {report['invalid']}, duplicates: {report['duplicates']}."
+                )
+
+    # Find registrant (exact email, any case)
+    search_email = st.text_input("🔍 Find registrant by email")
+    if search_email:
+        matches = store.find(search_email)
+        if matches:
+            st.dataframe(pd.DataFrame(matches), use_container_width=True)
+        else:
+            st.info(f"No registrations found for {search_email}.")
+
+    total = store.count()
+    if total == 0:
         st.info("No registrations yet.")
     else:
-        df = pd.DataFrame(st.session_state.registrations)
+        # Filters and sorting run in the store, only the visible page is fetched
+        f1, f2, f3 = st.columns(3)
+        with f1:
+            event_filter = st.selectbox("Event", ["All"] + EVENTS)
+        with f2:
+            email_filter = st.text_input("Email contains")
+        with f3:
+            date_range = st.date_input("Registered between", value=())
+        s1, s2, s3 = st.columns(3)
+        with s1:
+            sort_by = st.selectbox("Sort by", list(SORT_COLUMNS))
+        with s2:
+            descending = st.radio("Order", ["Descending", "Ascending"], horizontal=True) == "Descending"
+        with s3:
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1)
 
-        # Show table
-        st.dataframe(df, use_container_width=True)
+        filters = {
+            "event": None if event_filter == "All" else event_filter,
+            "email_contains": email_filter.strip() or None,
+            "date_from": date_range[0] if len(date_range) > 0 else None,
+            "date_to": date_range[1] if len(date_range) > 1 else None,
+        }
+        matching = store.count_matching(**filters)
+        num_pages = max((matching + page_size - 1) // page_size, 1)
+        page = st.number_input("Page", min_value=1, max_value=num_pages, value=1, step=1)
+        st.caption(f"Page {page} of {num_pages} ({matching} of {total} registrations)")
+        df = pd.DataFrame(
+            store.fetch_page(page - 1, page_size, sort_by=sort_by, descending=descending, **filters),
+            columns=COLUMNS,
+        )
+        st.dataframe(df, use_container_width=True, hide_index=True)
 
-        # Show counts by event
-        counts = df["Event"].value_counts().reset_index()
-        counts.columns = ["Event", "Registrations"]
+        # Show counts by event (running counters, no table scan)
+        counts = pd.DataFrame(list(store.event_counts().items()), columns=["Event", "Registrations"])
         st.bar_chart(counts.set_index("Event"))
 
-        # Export to CSV
-        csv_buffer = io.StringIO()
-        df.to_csv(csv_buffer, index=False)
-        st.download_button(
-            label="📥 Download Registrations as CSV",
-            data=csv_buffer.getvalue(),
-            file_name="registrations.csv",
-            mime="text/csv",
-        )
+        # Remove a registration
+        with st.form("delete_form"):
+            delete_id = st.number_input("Registration ID to remove", min_value=1, step=1)
+            if st.form_submit_button("🗑️ Remove Registration"):
+                if store.delete(int(delete_id)):
+                    st.success(f"Removed registration #{delete_id}.")
+                    st.rerun()
+                else:
+                    st.warning(f"⚠️ No registration with ID {delete_id}.")
+
+        # Export (only built when asked for, streamed from the store in chunks)
+        st.subheader("📥 Export")
+        export_format = st.selectbox("Format", list(EXPORT_FORMATS))
+        if st.button("⚙️ Prepare Export"):
+            # Drop the previous export file before building a new one
+            if st.session_state.export and os.path.exists(st.session_state.export[0]):
+                os.remove(st.session_state.export[0])
+            st.session_state.export = None
+            with st.spinner("Exporting registrations..."):
+                try:
+                    st.session_state.export = (export_registrations(store, export_format), export_format)
+                except RuntimeError as e:
+                    st.error(f"⚠️ {e}")
+
+        if st.session_state.export and os.path.exists(st.session_state.export[0]):
+            export_path, fmt = st.session_state.export
+            st.download_button(
+                label=f"📥 Download Registrations ({fmt})",
+                data=partial(read_file, export_path),
+                file_name="registrations" + EXPORT_FORMATS[fmt]["suffix"],
+                mime=EXPORT_FORMATS[fmt]["mime"],
+            )
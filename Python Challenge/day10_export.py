@@ -0,0 +1,51 @@
+import csv
+import gzip
+import tempfile
+from day10_store import COLUMNS, DEFAULT_CHUNK_SIZE
+
+# ----------------- FORMATS -----------------
+EXPORT_FORMATS = {
+    "CSV": {"suffix": ".csv", "mime": "text/csv"},
+    "CSV (gzip)": {"suffix": ".csv.gz", "mime": "application/gzip"},
+    "Parquet": {"suffix": ".parquet", "mime": "application/octet-stream"},
+}
+
+
+# ----------------- WRITERS -----------------
+def _write_csv(chunks, path, compress=False):
+    opener = gzip.open if compress else open
+    with opener(path, "wt", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for chunk in chunks:
+            writer.writerows(chunk)
+
+
+def _write_parquet(chunks, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([("ID", pa.int64())] + [(c, pa.string()) for c in COLUMNS[1:]])
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays([list(col) for col in columns], schema=schema))
+
+
+def export_registrations(store, fmt="CSV", path=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream every registration from `store` into a file chunk by chunk and return its path"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if path is None:
+        with tempfile.NamedTemporaryFile(suffix=EXPORT_FORMATS[fmt]["suffix"], delete=False) as f:
+            path = f.name
+
+    chunks = store.iter_chunks(chunk_size)
+    if fmt == "Parquet":
+        _write_parquet(chunks, path)
+    else:
+        _write_csv(chunks, path, compress=(fmt == "CSV (gzip)"))
+    return path
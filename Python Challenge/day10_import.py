@@ -0,0 +1,76 @@
+import re
+import time
+import pandas as pd
+from day10_store import EVENTS
+
+# Simple "something@something.tld" check, applied to a whole column at once
+EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+REQUIRED_COLUMNS = ["Name", "Email", "Event"]
+
+
+def is_valid_email(email):
+    """Check a single email with the same rule the bulk import uses"""
+    return re.fullmatch(EMAIL_PATTERN, email.strip()) is not None
+
+
+def read_upload(file, filename):
+    """Read an uploaded CSV or JSONL file into a DataFrame"""
+    if filename.lower().endswith((".jsonl", ".ndjson")):
+        df = pd.read_json(file, lines=True, dtype=str)
+    else:
+        df = pd.read_csv(file, dtype=str, keep_default_na=False)
+
+    # Accept any capitalisation of the column names
+    df.columns = [str(c).strip().title() for c in df.columns]
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    return df[REQUIRED_COLUMNS]
+
+
+def validate_registrations(df):
+    """Clean and validate a DataFrame of registrations, returns (valid_df, invalid_df, duplicate_count)"""
+    df = df.fillna("").astype(str)
+    df = pd.DataFrame({
+        "Name": df["Name"].str.strip(),
+        "Email": df["Email"].str.strip(),
+        "Event": df["Event"].str.strip().str.title(),
+    })
+
+    ok = (
+        (df["Name"] != "")
+        & df["Email"].str.fullmatch(EMAIL_PATTERN)
+        & df["Event"].isin(EVENTS)
+    )
+    valid, invalid = df[ok], df[~ok]
+
+    # Same email (any case) for the same event counts once
+    key = valid["Email"].str.lower() + "|" + valid["Event"]
+    dupes = key.duplicated()
+    return valid[~dupes], invalid, int(dupes.sum())
+
+
+def import_registrations(store, df, batch_size=None):
+    """Validate, dedupe and insert registrations in batches, returns a throughput report
+
+    Duplicates are counted both within the upload and against existing registrations.
+    """
+    start = time.perf_counter()
+    valid, invalid, duplicates = validate_registrations(df)
+
+    rows = list(valid.itertuples(index=False, name=None))
+    batch_size = batch_size or len(rows) or 1
+    inserted = 0
+    for i in range(0, len(rows), batch_size):
+        # The store skips anyone already registered for that event
+        inserted += store.add_many(rows[i:i + batch_size])
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows_read": len(df),
+        "inserted": inserted,
+        "invalid": len(invalid),
+        "duplicates": duplicates + len(rows) - inserted,
+        "seconds": seconds,
+        "rows_per_second": len(df) / seconds if seconds else 0.0,
+    }
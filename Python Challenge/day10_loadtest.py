@@ -0,0 +1,113 @@
+"""Load test for day10 seat allocation.
+
+Hammers one shared store from many threads (the way Streamlit sessions share
+it) and checks that no event ends up with more confirmed seats than capacity,
+both in the store's counters and in the rows actually saved.
+
+    python day10_loadtest.py --threads 200 --submits 50 --capacity 500
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from day10_store import COLUMNS, CONFIRMED, EVENTS, create_store
+
+
+def run_load_test(store, threads=100, submits_per_thread=50):
+    """Submit registrations from many threads at once, returns (elapsed seconds, statuses)"""
+    barrier = threading.Barrier(threads)
+    statuses = []
+    statuses_lock = threading.Lock()
+
+    def worker(worker_id):
+        results = []
+        barrier.wait()  # Start every thread at the same moment
+        for i in range(submits_per_thread):
+            event = EVENTS[(worker_id + i) % len(EVENTS)]
+            results.append((event, store.add(f"User {worker_id}-{i}", f"user{worker_id}_{i}@example.com", event)))
+        with statuses_lock:
+            statuses.extend(results)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start, statuses
+
+
+def saved_confirmed(store):
+    """{event: confirmed rows} counted from what was saved, not from the store's counters
+
+    For SQLite this reads the database file over a separate connection.
+    """
+    if getattr(store, "path", None) not in (None, ":memory:"):
+        conn = sqlite3.connect(store.path)
+        try:
+            return dict(conn.execute(
+                "SELECT event, COUNT(*) FROM registrations WHERE status = ? GROUP BY event", (CONFIRMED,)
+            ))
+        finally:
+            conn.close()
+    event_col, status_col = COLUMNS.index("Event"), COLUMNS.index("Status")
+    counts = {}
+    for chunk in store.iter_chunks():
+        for row in chunk:
+            if row[status_col] == CONFIRMED:
+                counts[row[event_col]] = counts.get(row[event_col], 0) + 1
+    return counts
+
+
+def check_no_overbooking(store, statuses):
+    """Return a list of problems (empty when every event is within capacity)"""
+    problems = []
+    saved = saved_confirmed(store)
+    for event, (confirmed, waitlisted, capacity) in store.seat_counts().items():
+        handed_out = sum(1 for e, status in statuses if e == event and status == CONFIRMED)
+        in_db = saved.get(event, 0)
+        if confirmed > capacity:
+            problems.append(f"{event}: {confirmed} confirmed for {capacity} seats")
+        if in_db > capacity:
+            problems.append(f"{event}: {in_db} confirmed rows saved for {capacity} seats")
+        if handed_out != confirmed:
+            problems.append(f"{event}: {handed_out} confirmations returned but {confirmed} counted")
+        if in_db != confirmed:
+            problems.append(f"{event}: {in_db} confirmed rows saved but {confirmed} counted")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent seat-allocation load test")
+    parser.add_argument("--threads", type=int, default=100)
+    parser.add_argument("--submits", type=int, default=50, help="registrations per thread")
+    parser.add_argument("--capacity", type=int, default=500, help="seats per event")
+    parser.add_argument("--backend", default="sqlite", choices=["sqlite", "memory"])
+    args = parser.parse_args()
+
+    capacities = {event: args.capacity for event in EVENTS}
+    if args.backend == "sqlite":
+        path = os.path.join(tempfile.mkdtemp(), "loadtest.db")
+        store = create_store("sqlite", path=path, capacities=capacities)
+    else:
+        store = create_store("memory", capacities=capacities)
+
+    elapsed, statuses = run_load_test(store, args.threads, args.submits)
+    total = len(statuses)
+    print(f"{total} submits from {args.threads} threads in {elapsed:.2f}s ({total / elapsed:,.0f} submits/s)")
+    for event, (confirmed, waitlisted, capacity) in store.seat_counts().items():
+        print(f"  {event}: {confirmed}/{capacity} confirmed, {waitlisted} waitlisted")
+
+    problems = check_no_overbooking(store, statuses)
+    if problems:
+        print("❌ Overbooking detected:")
+        for problem in problems:
+            print("  " + problem)
+        raise SystemExit(1)
+    print("✅ No overbooking")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from itertools import islice
+
+# ----------------- CONFIG -----------------
+EVENTS = ["Morning", "Afternoon", "Evening"]
+COLUMNS = ["ID", "Name", "Email", "Event", "Status", "Registered At"]
+
+# Seats per event; anyone past the limit goes on that event's waitlist
+DEFAULT_CAPACITIES = {"Morning": 100, "Afternoon": 100, "Evening": 100}
+CONFIRMED = "Confirmed"
+WAITLISTED = "Waitlisted"
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "registrations.db")
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 10000
+
+# Admin table columns that can be sorted on, and their SQLite column
+SORT_COLUMNS = {
+    "ID": "id",
+    "Name": "name",
+    "Email": "email",
+    "Event": "event",
+    "Status": "status",
+    "Registered At": "registered_at",
+}
+
+
+def normalize_email(email):
+    """Key used for duplicate detection and registrant lookup"""
+    return email.strip().lower()
+
+
+def _date_bounds(date_from, date_to):
+    """Turn optional dates into ISO string bounds [start, end) for registered_at"""
+    start = date_from.isoformat() if date_from else None
+    end = (date_to + timedelta(days=1)).isoformat() if date_to else None
+    return start, end
+
+
+# ----------------- BACKENDS -----------------
+class RegistrationStore:
+    """Interface every registration backend implements.
+
+    Subclasses provide _insert, _remove, _set_status and _fetch_ids plus the
+    read methods. The base class keeps the running counters, the duplicate
+    index (normalized email -> {event: [registration ids]}) and the per-event
+    waitlists in sync with every write. New duplicates are refused, but a
+    database saved before that check can hold several rows per email+event,
+    so the index keeps every ID and a key only goes when its last row does.
+
+    Seat allocation happens under one lock, so every Streamlit session of a
+    server shares a single, consistent view of who got a seat.
+    """
+
+    def _init_indexes(self, existing=(), capacities=None):
+        """Build counters, the email index and waitlists from (id, email, event, status) rows"""
+        self._lock = threading.Lock()
+        self._capacities = dict(capacities or DEFAULT_CAPACITIES)
+        self._counts = {}
+        self._confirmed = {}
+        self._waitlist = {}  # event -> {registration id: None}, oldest first
+        self._total = 0
+        self._index = {}
+        for registration_id, email, event, status in existing:
+            self._track(registration_id, email, event, status)
+
+    def add(self, name, email, event):
+        """Save a single registration, returns its status or None if it was a duplicate"""
+        statuses = self._add_rows([(name, email, event)])
+        return statuses[0] if statuses else None
+
+    def add_many(self, rows):
+        """Save many (name, email, event) rows, skipping email+event duplicates.
+
+        Returns how many rows were saved.
+        """
+        return len(self._add_rows(rows))
+
+    def _add_rows(self, rows):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            fresh = []
+            seen = set()
+            seats_taken = {}
+            for name, email, event in rows:
+                key = (normalize_email(email), event)
+                if key in seen or event in self._index.get(key[0], {}):
+                    continue
+                seen.add(key)
+
+                # Allocate a seat while still holding the lock, so no two sessions get the last one
+                taken = self._confirmed.get(event, 0) + seats_taken.get(event, 0)
+                if taken < self.capacity(event):
+                    status = CONFIRMED
+                    seats_taken[event] = seats_taken.get(event, 0) + 1
+                else:
+                    status = WAITLISTED
+                fresh.append((name, email, event, status))
+
+            ids = self._insert(fresh, now)
+            for (_, email, event, status), registration_id in zip(fresh, ids):
+                self._track(registration_id, email, event, status)
+        return [status for _, _, _, status in fresh]
+
+    def delete(self, registration_id):
+        """Remove one registration by ID, returns True if it existed
+
+        A freed seat goes to the oldest registration on that event's waitlist.
+        """
+        with self._lock:
+            removed = self._remove(registration_id)
+            if removed is None:
+                return False
+            email, event, status = removed
+            self._untrack(registration_id, email, event, status)
+            self._promote(event)
+            return True
+
+    def capacity(self, event):
+        """Seats available for an event"""
+        return self._capacities.get(event, 0)
+
+    def set_capacity(self, event, seats):
+        """Change an event's capacity, promoting waitlisted registrations into new seats"""
+        with self._lock:
+            self._capacities[event] = seats
+            self._save_capacity(event, seats)
+            self._promote(event)
+
+    def seat_counts(self):
+        """Return {event: (confirmed, waitlisted, capacity)} from the running counters"""
+        events = list(self._capacities) + [e for e in self._counts if e not in self._capacities]
+        return {
+            event: (self._confirmed.get(event, 0), len(self._waitlist.get(event, {})), self.capacity(event))
+            for event in events
+        }
+
+    def _promote(self, event):
+        # Callers hold self._lock
+        waitlist = self._waitlist.get(event, {})
+        promoted = []
+        while waitlist and self._confirmed.get(event, 0) < self.capacity(event):
+            registration_id = next(iter(waitlist))
+            del waitlist[registration_id]
+            self._confirmed[event] = self._confirmed.get(event, 0) + 1
+            promoted.append(registration_id)
+        if promoted:
+            self._set_status(promoted, CONFIRMED)
+
+    def is_registered(self, email, event):
+        """O(1) check whether this email already registered for this event"""
+        return event in self._index.get(normalize_email(email), {})
+
+    def find(self, email):
+        """Return every registration for an email (any case/whitespace) via the hash index"""
+        ids = sorted(i for event_ids in self._index.get(normalize_email(email), {}).values() for i in event_ids)
+        return self._fetch_ids(ids) if ids else []
+
+    def count(self):
+        """Total number of registrations (O(1), read from the running counters)"""
+        return self._total
+
+    def event_counts(self):
+        """Return {event: number of registrations} (O(1), read from the running counters)"""
+        return {event: n for event, n in self._counts.items() if n}
+
+    def count_matching(self, event=None, email_contains=None, date_from=None, date_to=None):
+        """Number of registrations matching the admin filters
+
+        Uses the running counters when only the event filter is set.
+        """
+        if not email_contains and not date_from and not date_to:
+            return self._counts.get(event, 0) if event else self._total
+        return self._count_filtered(event, email_contains, date_from, date_to)
+
+    def _count_filtered(self, event, email_contains, date_from, date_to):
+        raise NotImplementedError
+
+    def _track(self, registration_id, email, event, status):
+        # Callers hold self._lock
+        self._index.setdefault(normalize_email(email), {}).setdefault(event, []).append(registration_id)
+        self._counts[event] = self._counts.get(event, 0) + 1
+        if status == CONFIRMED:
+            self._confirmed[event] = self._confirmed.get(event, 0) + 1
+        else:
+            self._waitlist.setdefault(event, {})[registration_id] = None
+        self._total += 1
+
+    def _untrack(self, registration_id, email, event, status):
+        key = normalize_email(email)
+        events = self._index.get(key, {})
+        ids = events.get(event, [])
+        if registration_id in ids:
+            ids.remove(registration_id)
+        if not ids:
+            events.pop(event, None)
+        if not events:
+            self._index.pop(key, None)
+        self._counts[event] -= 1
+        if status == CONFIRMED:
+            self._confirmed[event] -= 1
+        else:
+            self._waitlist.get(event, {}).pop(registration_id, None)
+        self._total -= 1
+
+    def _insert(self, rows, registered_at):
+        """Write (name, email, event, status) rows, returns their new IDs in order"""
+        raise NotImplementedError
+
+    def _remove(self, registration_id):
+        """Delete a row, returns its (email, event, status) or None if missing"""
+        raise NotImplementedError
+
+    def _set_status(self, ids, status):
+        """Update the status of these registrations"""
+        raise NotImplementedError
+
+    def _save_capacity(self, event, seats):
+        """Persist a capacity change (backends without storage keep it in memory only)"""
+
+    def _fetch_ids(self, ids):
+        """Return the rows with these IDs as dicts"""
+        raise NotImplementedError
+
+    def fetch_page(self, page=0, page_size=50, sort_by="ID", descending=True,
+                   event=None, email_contains=None, date_from=None, date_to=None):
+        """Return one page of registrations as a list of dicts
+
+        Filters: exact event, case-insensitive email substring and an inclusive
+        date range on the registration date. Only the requested page is read.
+        """
+        raise NotImplementedError
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield registrations oldest first as lists of row tuples (in COLUMNS order)"""
+        raise NotImplementedError
+
+
+class MemoryRegistrationStore(RegistrationStore):
+    """Keeps registrations in a dict (shared by every session of one server)"""
+
+    def __init__(self, capacities=None):
+        self._rows = {}
+        self._next_id = 1
+        self._init_indexes(capacities=capacities)
+
+    def _insert(self, rows, registered_at):
+        ids = []
+        for name, email, event, status in rows:
+            self._rows[self._next_id] = {"ID": self._next_id, "Name": name, "Email": email,
+                                         "Event": event, "Status": status, "Registered At": registered_at}
+            ids.append(self._next_id)
+            self._next_id += 1
+        return ids
+
+    def _remove(self, registration_id):
+        row = self._rows.pop(registration_id, None)
+        return None if row is None else (row["Email"], row["Event"], row["Status"])
+
+    def _set_status(self, ids, status):
+        for registration_id in ids:
+            self._rows[registration_id]["Status"] = status
+
+    def _fetch_ids(self, ids):
+        with self._lock:
+            return [dict(self._rows[i]) for i in ids if i in self._rows]
+
+    def _matching(self, event, email_contains, date_from, date_to):
+        # Callers hold self._lock
+        start, end = _date_bounds(date_from, date_to)
+        needle = email_contains.lower() if email_contains else None
+        for row in self._rows.values():
+            if event and row["Event"] != event:
+                continue
+            if needle and needle not in row["Email"].lower():
+                continue
+            if start and row["Registered At"] < start:
+                continue
+            if end and row["Registered At"] >= end:
+                continue
+            yield row
+
+    def _count_filtered(self, event, email_contains, date_from, date_to):
+        with self._lock:
+            return sum(1 for _ in self._matching(event, email_contains, date_from, date_to))
+
+    def fetch_page(self, page=0, page_size=50, sort_by="ID", descending=True,
+                   event=None, email_contains=None, date_from=None, date_to=None):
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort_by}")
+        start = page * page_size
+        with self._lock:
+            if sort_by == "ID" and not (event or email_contains or date_from or date_to):
+                # Rows are already in ID order, so just slice from the right end
+                rows = reversed(self._rows.values()) if descending else iter(self._rows.values())
+            else:
+                rows = sorted(self._matching(event, email_contains, date_from, date_to),
+                              key=lambda row: (row[sort_by], row["ID"]), reverse=descending)
+            return [dict(row) for row in islice(rows, start, start + page_size)]
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        start = 0
+        while True:
+            with self._lock:
+                chunk = [tuple(row[c] for c in COLUMNS)
+                         for row in islice(self._rows.values(), start, start + chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+            start += chunk_size
+
+
+class SQLiteRegistrationStore(RegistrationStore):
+    """Stores registrations in SQLite (WAL mode) so they survive restarts"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=DEFAULT_BATCH_SIZE, capacities=None):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS registrations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL,
+                event TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'Confirmed',
+                registered_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_registrations_email ON registrations(email);
+            CREATE INDEX IF NOT EXISTS idx_registrations_event ON registrations(event);
+            CREATE INDEX IF NOT EXISTS idx_registrations_registered_at ON registrations(registered_at);
+            CREATE INDEX IF NOT EXISTS idx_registrations_name ON registrations(name, id);
+            CREATE TABLE IF NOT EXISTS capacities (
+                event TEXT PRIMARY KEY,
+                seats INTEGER NOT NULL
+            );
+        """)
+        # Databases created before seat allocation have no status column
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(registrations)")]
+        if "status" not in columns:
+            self.conn.execute("ALTER TABLE registrations ADD COLUMN status TEXT NOT NULL DEFAULT 'Confirmed'")
+        # For sorting by Status (like idx_registrations_name for Name); created here, after the column exists
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_registrations_status ON registrations(status, id)")
+        self.conn.commit()
+
+        # Capacities saved from the Admin Panel win over the defaults
+        capacities = dict(capacities or DEFAULT_CAPACITIES)
+        capacities.update(self.conn.execute("SELECT event, seats FROM capacities"))
+
+        # Build the counters, email index and waitlists once; after that they are updated on every write
+        self._init_indexes(
+            self.conn.execute("SELECT id, email, event, status FROM registrations ORDER BY id"),
+            capacities=capacities,
+        )
+
+    def _insert(self, rows, registered_at):
+        ids = []
+        # Insert in batches so one huge import doesn't hold a giant transaction
+        for start in range(0, len(rows), self.batch_size):
+            with self.conn:
+                for name, email, event, status in rows[start:start + self.batch_size]:
+                    cursor = self.conn.execute(
+                        "INSERT INTO registrations (name, email, event, status, registered_at) VALUES (?, ?, ?, ?, ?)",
+                        (name, email, event, status, registered_at),
+                    )
+                    ids.append(cursor.lastrowid)
+        return ids
+
+    def _remove(self, registration_id):
+        row = self.conn.execute(
+            "SELECT email, event, status FROM registrations WHERE id = ?", (registration_id,)
+        ).fetchone()
+        if row is not None:
+            with self.conn:
+                self.conn.execute("DELETE FROM registrations WHERE id = ?", (registration_id,))
+        return row
+
+    def _save_capacity(self, event, seats):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO capacities (event, seats) VALUES (?, ?)", (event, seats))
+
+    def _set_status(self, ids, status):
+        with self.conn:
+            self.conn.executemany("UPDATE registrations SET status = ? WHERE id = ?", [(status, i) for i in ids])
+
+    def _fetch_ids(self, ids):
+        placeholders = ", ".join("?" * len(ids))
+        with self._lock:
+            cursor = self.conn.execute(
+                f"SELECT id, name, email, event, status, registered_at FROM registrations WHERE id IN ({placeholders}) ORDER BY id",
+                ids,
+            )
+            return [dict(zip(COLUMNS, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _where(event, email_contains, date_from, date_to):
+        """Build the WHERE clause and parameters for the admin filters"""
+        clauses, params = [], []
+        if event:
+            clauses.append("event = ?")
+            params.append(event)
+        if email_contains:
+            clauses.append("email LIKE ? ESCAPE '\\'")
+            escaped = email_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        start, end = _date_bounds(date_from, date_to)
+        if start:
+            clauses.append("registered_at >= ?")
+            params.append(start)
+        if end:
+            clauses.append("registered_at < ?")
+            params.append(end)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _count_filtered(self, event, email_contains, date_from, date_to):
+        where, params = self._where(event, email_contains, date_from, date_to)
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM registrations{where}", params).fetchone()[0]
+
+    def fetch_page(self, page=0, page_size=50, sort_by="ID", descending=True,
+                   event=None, email_contains=None, date_from=None, date_to=None):
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort_by}")
+        where, params = self._where(event, email_contains, date_from, date_to)
+        direction = "DESC" if descending else "ASC"
+        order = f"{SORT_COLUMNS[sort_by]} {direction}, id {direction}" if sort_by != "ID" else f"id {direction}"
+        with self._lock:
+            cursor = self.conn.execute(
+                f"SELECT id, name, email, event, status, registered_at FROM registrations{where} "
+                f"ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [page_size, page * page_size],
+            )
+            return [dict(zip(COLUMNS, row)) for row in cursor.fetchall()]
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        last_id = 0
+        while True:
+            # Keyset pagination: the lock is only held per chunk, so other sessions keep writing
+            with self._lock:
+                chunk = self.conn.execute(
+                    "SELECT id, name, email, event, status, registered_at FROM registrations "
+                    "WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, chunk_size),
+                ).fetchall()
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1][0]
+
+
+BACKENDS = {
+    "sqlite": SQLiteRegistrationStore,
+    "memory": MemoryRegistrationStore,
+}
+
+
+def create_store(backend=None, **kwargs):
+    """Build the backend named by `backend` (or $EVENTREG_BACKEND, default sqlite)"""
+    backend = backend or os.getenv("EVENTREG_BACKEND", "sqlite")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown registration backend: {backend}")
+    if backend == "sqlite" and "path" not in kwargs and os.getenv("EVENTREG_DB_PATH"):
+        kwargs["path"] = os.getenv("EVENTREG_DB_PATH")
+    return BACKENDS[backend](**kwargs)
@@ -0,0 +1,125 @@
+"""Benchmarks for the day11 billing code.
+
+    python day11_bench.py rerun --items 20 --reruns 200
+    python day11_bench.py money --lines 1000000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+import numpy as np
+from streamlit.testing.v1 import AppTest
+from day11_billing import invoice_pdf, order_key, price_cart
+from day11_orders import OrderStore
+from money import from_cents, line_totals, to_cents_array, total_cents
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "day11_restaurant.py")
+MENU = {f"Item {i}": 2.5 + i for i in range(300)}
+
+
+def time_per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def bench_rerun(items, reruns):
+    """Time whole reruns of the restaurant app, the script a browser session actually runs
+
+    Uses Streamlit's AppTest against a throwaway order database holding one
+    order of `items` lines on Table 1. Times include AppTest's own overhead.
+    """
+    work_dir = tempfile.mkdtemp()
+    old_db_path = os.environ.get("RESTAURANT_DB_PATH")
+    os.environ["RESTAURANT_DB_PATH"] = os.path.join(work_dir, "orders.db")
+    try:
+        store = OrderStore(os.environ["RESTAURANT_DB_PATH"])
+        order_id = store.open_order(1)
+        for name in list(MENU)[:items]:
+            store.add_item(order_id, name, 2, MENU[name])
+        bill = price_cart(order_key(store.get_order(order_id)["items"]))
+
+        app = AppTest.from_file(APP_PATH, default_timeout=60)
+        app.run()  # first run imports modules and fills the caches
+        no_invoice_ms = time_per_call(app.run, reruns)
+
+        prepare = next(b for b in app.button if b.label == "🧾 Prepare Invoice")
+        start = time.perf_counter()
+        prepare.click().run()
+        click_ms = (time.perf_counter() - start) * 1000
+        while not any(b.label == "📥 Download Invoice (PDF)" for b in app.get("download_button")):
+            time.sleep(0.01)
+            app.run()
+        invoice_ms = time_per_call(app.run, reruns)
+        pdf_ms = time_per_call(lambda: invoice_pdf(bill), 10)
+    finally:
+        if old_db_path is None:
+            os.environ.pop("RESTAURANT_DB_PATH", None)
+        else:
+            os.environ["RESTAURANT_DB_PATH"] = old_db_path
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"Restaurant app, order of {len(bill['lines'])} items, {reruns} reruns each")
+    print(f"  rerun, no invoice asked for:   {no_invoice_ms:8.2f} ms/rerun")
+    print(f"  Prepare Invoice click:         {click_ms:8.2f} ms (PDF renders in the background)")
+    print(f"  rerun, invoice ready:          {invoice_ms:8.2f} ms/rerun")
+    print(f"  PDF render (once per cart):    {pdf_ms:8.2f} ms, paid every rerun before invoices were deferred")
+
+
+def bench_money(lines, seed=0):
+    """Float vs integer-cents aggregation of many order lines: speed and exactness"""
+    rng = np.random.default_rng(seed)
+    quantities = rng.integers(1, 10, size=lines)
+    prices = rng.integers(50, 5000, size=lines) / 100  # $0.50 - $49.99, as floats like the menu
+
+    # Reference: exact Decimal arithmetic, one line at a time
+    start = time.perf_counter()
+    exact = sum((Decimal(str(p)) * int(q) for q, p in zip(quantities.tolist(), prices.tolist())), Decimal(0))
+    decimal_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop_total = 0.0
+    for q, p in zip(quantities.tolist(), prices.tolist()):
+        loop_total += q * p
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    float_total = float(np.sum(quantities * prices))
+    float_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cents_total = total_cents(line_totals(quantities, to_cents_array(prices)))
+    cents_s = time.perf_counter() - start
+
+    print(f"{lines:,} order lines, exact total ${exact:,}")
+    for label, total, seconds in [
+        ("Decimal loop (reference)", exact, decimal_s),
+        ("float loop", loop_total, loop_s),
+        ("float NumPy", float_total, float_s),
+        ("int cents NumPy", from_cents(cents_total), cents_s),
+    ]:
+        drift = Decimal(repr(total)) - exact if isinstance(total, float) else total - exact
+        print(f"  {label:26s} {seconds * 1000:9.2f} ms   total {total!s:>20}   drift {drift}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="day11 billing benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    rerun = sub.add_parser("rerun", help="time full reruns of the restaurant app")
+    rerun.add_argument("--items", type=int, default=20)
+    rerun.add_argument("--reruns", type=int, default=200)
+    money = sub.add_parser("money", help="float vs integer-cents totals on many lines")
+    money.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if args.bench == "rerun":
+        bench_rerun(args.items, args.reruns)
+    elif args.bench == "money":
+        bench_money(args.lines)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from money import apply_rate, from_cents, to_cents
+
+TAX_RATE = 0.06  # 6% tax
+INVOICE_COLUMNS = ["Item", "Quantity", "Price", "Total"]
+
+
+# ----------------- PRICING -----------------
+def order_key(items):
+    """Hashable snapshot of an order's {item: (qty, unit price)}: ((item, qty, unit price), ...)
+
+    Two orders with the same key always produce the same bill, so it is used
+    as the cache key for pricing and invoice rendering.
+    """
+    return tuple((item, qty, price) for item, (qty, price) in items.items())
+
+
+def price_cart(key, tax_rate=TAX_RATE):
+    """Compute line totals, subtotal, tax and grand total for a cart key
+
+    Everything is worked out in integer cents (tax rounded half up once, on
+    the subtotal) and returned as exact two-place Decimals, plus the cents.
+    """
+    line_cents = [(item, qty, to_cents(price)) for item, qty, price in key]
+    subtotal = sum(qty * unit for _, qty, unit in line_cents)
+    tax = apply_rate(subtotal, tax_rate)
+    return {
+        "lines": [(item, qty, from_cents(unit), from_cents(qty * unit)) for item, qty, unit in line_cents],
+        "subtotal": from_cents(subtotal),
+        "tax": from_cents(tax),
+        "total": from_cents(subtotal + tax),
+        "subtotal_cents": subtotal,
+        "tax_cents": tax,
+        "total_cents": subtotal + tax,
+        "tax_rate": tax_rate,
+    }
+
+
+def bill_table(bill):
+    """Line items of a bill as a DataFrame"""
+    return pd.DataFrame(bill["lines"], columns=INVOICE_COLUMNS)
+
+
+# ----------------- INVOICES -----------------
+def invoice_csv(bill):
+    """Render a priced bill as CSV text"""
+    tax_label = f"Tax ({bill['tax_rate']:.0%})"
+    df = bill_table(bill)
+    df.loc["Subtotal"] = ["", "", "", bill["subtotal"]]
+    df.loc[tax_label] = ["", "", "", bill["tax"]]
+    df.loc["Grand Total"] = ["", "", "", bill["total"]]
+    csv_buffer = io.StringIO()
+    df.to_csv(csv_buffer, index=False)
+    return csv_buffer.getvalue()
+
+
+PAGE_BOTTOM = 60  # start a new page once the next line would go below this
+LINE_HEIGHT = 20
+
+
+def _draw_table_header(c, y):
+    c.setFont("Helvetica", 12)
+    c.drawString(50, y, "Item")
+    c.drawString(250, y, "Qty")
+    c.drawString(300, y, "Price")
+    c.drawString(400, y, "Total")
+    return y - LINE_HEIGHT
+
+
+def draw_invoice(c, bill, title="🍔 Restaurant Invoice 🍕"):
+    """Draw one invoice onto a ReportLab canvas, breaking onto new pages as needed
+
+    Finishes with showPage(), so the next invoice starts on a fresh page.
+    """
+    width, height = letter
+
+    def new_page(first=False):
+        if not first:
+            c.showPage()
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(200, height - 50, title if first else f"{title} (continued)")
+        return _draw_table_header(c, height - 100)
+
+    y = new_page(first=True)
+    for item, qty, price, total in bill["lines"]:
+        if y < PAGE_BOTTOM:
+            y = new_page()
+        c.drawString(50, y, item)
+        c.drawString(250, y, str(qty))
+        c.drawString(300, y, f"${price:.2f}")
+        c.drawString(400, y, f"${total:.2f}")
+        y -= LINE_HEIGHT
+
+    # Keep the three total lines together on one page
+    if y - 4 * LINE_HEIGHT < PAGE_BOTTOM:
+        y = new_page()
+    y -= LINE_HEIGHT
+    c.drawString(300, y, "Subtotal:")
+    c.drawString(400, y, f"${bill['subtotal']:.2f}")
+    y -= LINE_HEIGHT
+    c.drawString(300, y, f"Tax ({bill['tax_rate']:.0%}):")
+    c.drawString(400, y, f"${bill['tax']:.2f}")
+    y -= LINE_HEIGHT
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(300, y, "Total:")
+    c.drawString(400, y, f"${bill['total']:.2f}")
+    c.showPage()
+
+
+def invoice_pdf(bill):
+    """Render a priced bill as PDF bytes"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    draw_invoice(c, bill)
+    c.save()
+    return buffer.getvalue()
+
+
+def invoices_pdf(titled_bills, path):
+    """Render many (title, bill) pairs into one multi-page PDF file"""
+    c = canvas.Canvas(path, pagesize=letter)
+    for title, bill in titled_bills:
+        draw_invoice(c, bill, title)
+    c.save()
+    return path
+
+
+class InvoiceRenderer:
+    """Renders invoice PDFs on a background thread pool, one job per cart key
+
+    Finished jobs are kept (up to max_jobs) so asking again for the same cart
+    returns the existing result instead of drawing the PDF again. Callers
+    check Future.done() rather than waiting on result(), so a page run never
+    blocks on a render.
+    """
+
+    def __init__(self, max_workers=2, max_jobs=256):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="invoice-pdf")
+        self._jobs = OrderedDict()
+        self._max_jobs = max_jobs
+        self._lock = threading.Lock()
+
+    def submit(self, key, bill):
+        """Start rendering the PDF for this cart (no-op if already started), returns the Future"""
+        with self._lock:
+            if key in self._jobs:
+                self._jobs.move_to_end(key)
+                return self._jobs[key]
+            future = self._pool.submit(invoice_pdf, bill)
+            self._jobs[key] = future
+            if len(self._jobs) > self._max_jobs:
+                self._jobs.popitem(last=False)
+            return future
+
+    def get(self, key):
+        """The Future for this cart, or None if it was never submitted (or was evicted)"""
+        with self._lock:
+            return self._jobs.get(key)
@@ -0,0 +1,118 @@
+import bisect
+import csv
+import hashlib
+import json
+import os
+import re
+from datetime import date
+
+DEFAULT_MENU_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "day11_menu.json")
+
+
+def _words(text):
+    """Lower-case search words of a name or category (emoji and punctuation dropped)"""
+    return re.findall(r"\w+", text.lower())
+
+
+class MenuCatalog:
+    """Menu items with categories, dated price history and indexed lookup
+
+    Lookups by name are dict hits, categories map to their item names, and
+    search goes through a word-prefix index instead of scanning every item.
+    """
+
+    def __init__(self, items):
+        self._items = {}        # name -> {"name", "category", "prices": [(date, price), ...]}
+        self._categories = {}   # category -> [names]
+        self._word_index = {}   # word -> {names}
+        for item in items:
+            self._add(item)
+        self._words = sorted(self._word_index)
+        self.version = self._compute_version()
+
+    def _add(self, item):
+        prices = item.get("prices") or [{"from": "1970-01-01", "price": item["price"]}]
+        history = sorted((date.fromisoformat(p["from"]), float(p["price"])) for p in prices)
+        name, category = item["name"], item.get("category", "Other")
+        self._items[name] = {"name": name, "category": category, "prices": history}
+        self._categories.setdefault(category, []).append(name)
+        for word in _words(name) + _words(category):
+            self._word_index.setdefault(word, set()).add(name)
+
+    def _compute_version(self):
+        # Short hash of the whole catalog: changes whenever any item, category or price changes
+        content = repr([(i["name"], i["category"], i["prices"]) for i in self._items.values()])
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+
+    # ----- loading -----
+    @classmethod
+    def from_json(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["items"])
+
+    @classmethod
+    def from_csv(cls, path):
+        """CSV with name, category, price and optional from (one row per price version)"""
+        items = {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                item = items.setdefault(row["name"], {"name": row["name"], "category": row.get("category") or "Other",
+                                                      "prices": []})
+                item["prices"].append({"from": row.get("from") or "1970-01-01", "price": row["price"]})
+        return cls(items.values())
+
+    @classmethod
+    def load(cls, path=DEFAULT_MENU_PATH):
+        """Load a .json or .csv menu file"""
+        return cls.from_csv(path) if path.lower().endswith(".csv") else cls.from_json(path)
+
+    # ----- lookup -----
+    def __contains__(self, name):
+        return name in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def names(self):
+        return list(self._items)
+
+    def categories(self):
+        return list(self._categories)
+
+    def category_of(self, name):
+        return self._items[name]["category"]
+
+    def price(self, name, on=None):
+        """Price of an item on a date (default today), using the latest version on or before it"""
+        history = self._items[name]["prices"]
+        i = bisect.bisect_right(history, (on or date.today(), float("inf")))
+        if i == 0:
+            raise KeyError(f"{name} has no price on {on or date.today()}")
+        return history[i - 1][1]
+
+    def price_history(self, name):
+        """[(effective date, price), ...] oldest first"""
+        return list(self._items[name]["prices"])
+
+    def search(self, query="", category=None):
+        """Item names matching every word of the query (as word prefixes), optionally in one category"""
+        names = self._categories.get(category, []) if category else self.names()
+        words = _words(query)
+        if not words:
+            return list(names)
+
+        matches = None
+        for word in words:
+            # All index words starting with this query word
+            i = bisect.bisect_left(self._words, word)
+            hits = set()
+            while i < len(self._words) and self._words[i].startswith(word):
+                hits |= self._word_index[self._words[i]]
+                i += 1
+            matches = hits if matches is None else matches & hits
+        return [name for name in names if name in matches]
+
+    def rows(self, names=None, on=None):
+        """(name, category, price) rows for display"""
+        names = self.names() if names is None else names
+        return [(name, self.category_of(name), self.price(name, on)) for name in names]
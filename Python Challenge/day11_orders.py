@@ -0,0 +1,219 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "orders.db")
+
+# ----------------- ORDER STATUS -----------------
+OPEN = "Open"
+IN_KITCHEN = "In Kitchen"
+READY = "Ready"
+SERVED = "Served"
+PAID = "Paid"
+CANCELLED = "Cancelled"
+
+# Allowed next statuses for each status
+TRANSITIONS = {
+    OPEN: [IN_KITCHEN, CANCELLED],
+    IN_KITCHEN: [READY, CANCELLED],
+    READY: [SERVED],
+    SERVED: [PAID],
+    PAID: [],
+    CANCELLED: [],
+}
+ACTIVE_STATUSES = [OPEN, IN_KITCHEN, READY, SERVED]
+
+
+class OrderStore:
+    """Orders for every table and terminal, shared through one SQLite database"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS orders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_no INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS order_items (
+                order_id INTEGER NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+                item TEXT NOT NULL,
+                qty INTEGER NOT NULL,
+                price REAL NOT NULL,
+                PRIMARY KEY (order_id, item)
+            );
+            CREATE INDEX IF NOT EXISTS idx_orders_status_table ON orders(status, table_no);
+            CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders(created_at);
+        """)
+        self.conn.commit()
+
+    # ----- orders -----
+    def _active_order(self, table_no):
+        # Callers hold self._lock
+        placeholders = ", ".join("?" * len(ACTIVE_STATUSES))
+        row = self.conn.execute(
+            f"SELECT id FROM orders WHERE status IN ({placeholders}) AND table_no = ? ORDER BY id DESC LIMIT 1",
+            ACTIVE_STATUSES + [table_no],
+        ).fetchone()
+        return row[0] if row else None
+
+    def active_order(self, table_no):
+        """ID of the table's current (unpaid, not cancelled) order, or None"""
+        with self._lock:
+            return self._active_order(table_no)
+
+    def open_order(self, table_no):
+        """Return the table's active order, starting a new one if it has none"""
+        with self._lock:
+            # Check and insert under one lock so two terminals can't both start an order
+            order_id = self._active_order(table_no)
+            if order_id is not None:
+                return order_id
+            now = datetime.now().isoformat(timespec="seconds")
+            with self.conn:
+                cursor = self.conn.execute(
+                    "INSERT INTO orders (table_no, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (table_no, OPEN, now, now),
+                )
+            return cursor.lastrowid
+
+    def get_order(self, order_id):
+        """Order header plus its items, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id, table_no, status, created_at, updated_at FROM orders WHERE id = ?", (order_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        order = dict(zip(["id", "table_no", "status", "created_at", "updated_at"], row))
+        order["items"] = self.items(order_id)
+        return order
+
+    def set_status(self, order_id, status):
+        """Move an order to a new status
+
+        The update only applies if the order is still in the status we read
+        (compare-and-swap), so two terminals can't both advance it.
+        Raises ValueError for transitions that aren't allowed.
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT status FROM orders WHERE id = ?", (order_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"Order {order_id} does not exist")
+            current = row[0]
+            if status not in TRANSITIONS[current]:
+                raise ValueError(f"Order {order_id} cannot go from {current} to {status}")
+            with self.conn:
+                cursor = self.conn.execute(
+                    "UPDATE orders SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                    (status, datetime.now().isoformat(timespec="seconds"), order_id, current),
+                )
+            if cursor.rowcount != 1:
+                raise ValueError(f"Order {order_id} was changed by another terminal")
+
+    def open_orders(self, statuses=None):
+        """Active orders (oldest first) with their items, for terminals and the kitchen display"""
+        statuses = statuses or ACTIVE_STATUSES
+        placeholders = ", ".join("?" * len(statuses))
+        with self._lock:
+            orders = self.conn.execute(
+                f"SELECT id, table_no, status, created_at, updated_at FROM orders "
+                f"WHERE status IN ({placeholders}) ORDER BY id",
+                statuses,
+            ).fetchall()
+            items = self.conn.execute(
+                f"SELECT order_id, item, qty, price FROM order_items WHERE order_id IN "
+                f"(SELECT id FROM orders WHERE status IN ({placeholders}))",
+                statuses,
+            ).fetchall()
+
+        result = {}
+        for row in orders:
+            result[row[0]] = dict(zip(["id", "table_no", "status", "created_at", "updated_at"], row))
+            result[row[0]]["items"] = {}
+        for order_id, item, qty, price in items:
+            result[order_id]["items"][item] = (qty, price)
+        return list(result.values())
+
+    def iter_orders(self, day=None, statuses=None, chunk_size=1000):
+        """Yield orders with their items in chunks (lists of order dicts, oldest first)
+
+        Optionally limited to orders created on `day` (a date) and to some
+        statuses. The lock is only held per chunk.
+        """
+        clauses, params = [], []
+        if day is not None:
+            clauses.append("created_at >= ? AND created_at < ?")
+            params += [day.isoformat(), (day + timedelta(days=1)).isoformat()]
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params += list(statuses)
+
+        last_id = 0
+        while True:
+            where = " AND ".join(clauses + ["id > ?"])
+            with self._lock:
+                orders = self.conn.execute(
+                    f"SELECT id, table_no, status, created_at, updated_at FROM orders "
+                    f"WHERE {where} ORDER BY id LIMIT ?",
+                    params + [last_id, chunk_size],
+                ).fetchall()
+                if not orders:
+                    return
+                ids = [row[0] for row in orders]
+                items = self.conn.execute(
+                    f"SELECT order_id, item, qty, price FROM order_items "
+                    f"WHERE order_id IN ({', '.join('?' * len(ids))}) ORDER BY rowid",
+                    ids,
+                ).fetchall()
+
+            chunk = {}
+            for row in orders:
+                chunk[row[0]] = dict(zip(["id", "table_no", "status", "created_at", "updated_at"], row))
+                chunk[row[0]]["items"] = {}
+            for order_id, item, qty, price in items:
+                chunk[order_id]["items"][item] = (qty, price)
+            yield list(chunk.values())
+            last_id = ids[-1]
+
+    # ----- items -----
+    def items(self, order_id):
+        """Return {item: (qty, unit price)} for an order"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT item, qty, price FROM order_items WHERE order_id = ? ORDER BY rowid", (order_id,)
+            ).fetchall()
+        return {item: (qty, price) for item, qty, price in rows}
+
+    def _check_editable(self, order_id):
+        # Callers hold self._lock
+        row = self.conn.execute("SELECT status FROM orders WHERE id = ?", (order_id,)).fetchone()
+        if row is None or row[0] != OPEN:
+            raise ValueError(f"Order {order_id} is no longer open for changes")
+
+    def add_item(self, order_id, item, qty, price):
+        """Add qty of an item to an open order (adds to any quantity already there)"""
+        with self._lock:
+            self._check_editable(order_id)
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO order_items (order_id, item, qty, price) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(order_id, item) DO UPDATE SET qty = qty + excluded.qty",
+                    (order_id, item, qty, price),
+                )
+
+    def remove_item(self, order_id, item):
+        """Take an item off an open order"""
+        with self._lock:
+            self._check_editable(order_id)
+            with self.conn:
+                self.conn.execute("DELETE FROM order_items WHERE order_id = ? AND item = ?", (order_id, item))
@@ -0,0 +1,118 @@
+import csv
+import os
+import shutil
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from day11_billing import invoices_pdf, order_key, price_cart
+from day11_orders import PAID
+from money import from_cents, to_cents
+
+SALES_COLUMNS = ["Order ID", "Table", "Status", "Created At", "Item", "Quantity", "Price", "Total"]
+EXPORT_FORMATS = {
+    "CSV": {"suffix": ".csv", "mime": "text/csv"},
+    "Parquet": {"suffix": ".parquet", "mime": "application/octet-stream"},
+}
+
+
+def _temp_path(suffix):
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        return f.name
+
+
+# ----------------- BATCH INVOICES -----------------
+def _invoice_title(order):
+    return f"Invoice - Order #{order['id']} - Table {order['table_no']}"
+
+
+def _render_invoice_file(args):
+    """Worker: render a group of orders into one multi-page PDF, returns (path, order count)"""
+    orders, path = args
+    titled_bills = [(_invoice_title(o), price_cart(order_key(o["items"]))) for o in orders]
+    invoices_pdf(titled_bills, path)
+    return path, len(orders)
+
+
+def batch_invoices_zip(store, day=None, statuses=(PAID,), zip_path=None, orders_per_file=500, workers=None):
+    """Render every matching order into multi-page PDFs on a process pool and zip them
+
+    Each PDF holds up to `orders_per_file` invoices. Only two groups per
+    worker are read and queued at a time, so memory stays flat however many
+    orders there are. Returns (zip path, number of orders); on an error the
+    partial zip is removed.
+    """
+    zip_path = zip_path or _temp_path(".zip")
+    work_dir = tempfile.mkdtemp(prefix="invoices-")
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    total = 0
+
+    def write(zf, future):
+        path, count = future.result()
+        zf.write(path, os.path.basename(path))
+        os.remove(path)
+        return count
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool, \
+                zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            pending = deque()
+            for n, orders in enumerate(store.iter_orders(day, statuses, chunk_size=orders_per_file)):
+                if len(pending) >= max_in_flight:
+                    total += write(zf, pending.popleft())
+                path = os.path.join(work_dir, f"invoices_{n + 1:04d}.pdf")
+                pending.append(pool.submit(_render_invoice_file, (orders, path)))
+            while pending:
+                total += write(zf, pending.popleft())
+    except BaseException:
+        if os.path.exists(zip_path):
+            os.remove(zip_path)
+        raise
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return zip_path, total
+
+
+# ----------------- END OF DAY SALES -----------------
+def iter_sales_rows(store, day=None, statuses=(PAID,), chunk_size=1000):
+    """Yield lists of order-line rows (SALES_COLUMNS order), one list per chunk of orders"""
+    for orders in store.iter_orders(day, statuses, chunk_size=chunk_size):
+        yield [
+            (o["id"], o["table_no"], o["status"], o["created_at"], item, qty,
+             from_cents(to_cents(price)), from_cents(qty * to_cents(price)))
+            for o in orders
+            for item, (qty, price) in o["items"].items()
+        ]
+
+
+def export_sales(store, day=None, fmt="CSV", statuses=(PAID,), path=None, chunk_size=1000):
+    """Stream the day's sales lines into a CSV or Parquet file and return its path"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    path = path or _temp_path(EXPORT_FORMATS[fmt]["suffix"])
+    chunks = iter_sales_rows(store, day, statuses, chunk_size)
+
+    if fmt == "CSV":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(SALES_COLUMNS)
+            for chunk in chunks:
+                writer.writerows(chunk)
+        return path
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([
+        ("Order ID", pa.int64()), ("Table", pa.int64()), ("Status", pa.string()),
+        ("Created At", pa.string()), ("Item", pa.string()), ("Quantity", pa.int64()),
+        ("Price", pa.decimal128(12, 2)), ("Total", pa.decimal128(12, 2)),
+    ])
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            if chunk:
+                writer.write_table(pa.Table.from_arrays([list(col) for col in zip(*chunk)], schema=schema))
+    return path
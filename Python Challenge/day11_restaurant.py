@@ -1,137 +1,249 @@
+import os
+from datetime import date
+from functools import partial
 import streamlit as st
 import pandas as pd
-import io
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from day11_billing import TAX_RATE, InvoiceRenderer, bill_table, invoice_csv, order_key, price_cart
+from day11_menu import DEFAULT_MENU_PATH, MenuCatalog
+from day11_orders import DEFAULT_DB_PATH, IN_KITCHEN, OPEN, PAID, READY, TRANSITIONS, OrderStore
+from day11_reports import EXPORT_FORMATS, batch_invoices_zip, export_sales
 
 st.set_page_config(page_title="🍔 Restaurant Order & Billing App", layout="wide")
 
 # ----------------- MENU -----------------
-MENU = {
-    "🍔 Burger": 8.5,
-    "🍕 Pizza": 12.0,
-    "🥗 Salad": 7.0,
-    "🥤 Soda": 2.5,
-    "🍟 Fries": 3.5,
-    "🍦 Ice Cream": 4.0,
-}
+MENU_PATH = os.getenv("RESTAURANT_MENU_PATH", DEFAULT_MENU_PATH)
 
-TAX_RATE = 0.06  # 6% tax
+# Reloaded only when the menu file changes
+@st.cache_resource
+def load_menu(path, modified):
+    return MenuCatalog.load(path)
+
+MENU = load_menu(MENU_PATH, os.path.getmtime(MENU_PATH))
+
+# Keyed on the day too, so a dated price change shows up (and matches what's charged) once it starts
+@st.cache_data(max_entries=64)
+def menu_table(names, version, day):
+    return pd.DataFrame(
+        [(name, category, price, 0) for name, category, price in MENU.rows(list(names), on=day)],
+        columns=["Item", "Category", "Price", "Qty"],
+    )
+
+NUM_TABLES = 30
+
+# ----------------- SHARED STATE -----------------
+# One order store for every terminal and the kitchen display
+@st.cache_resource
+def get_order_store():
+    return OrderStore(os.getenv("RESTAURANT_DB_PATH", DEFAULT_DB_PATH))
+
+store = get_order_store()
 
 # ----------------- SESSION STATE -----------------
-if "cart" not in st.session_state:
-    st.session_state.cart = {}
+if "invoice_key" not in st.session_state:
+    st.session_state.invoice_key = None  # cart the user last asked invoices for
+if "eod_files" not in st.session_state:
+    st.session_state.eod_files = {}  # end-of-day files built by this session
 
 # ----------------- FUNCTIONS -----------------
-def add_to_cart(item, qty):
-    if item in st.session_state.cart:
-        st.session_state.cart[item] += qty
-    else:
-        st.session_state.cart[item] = qty
-
-def remove_from_cart(item):
-    if item in st.session_state.cart:
-        del st.session_state.cart[item]
-
-def generate_invoice_csv(cart):
-    df = pd.DataFrame([(item, qty, MENU[item], qty * MENU[item]) for item, qty in cart.items()],
-                      columns=["Item", "Quantity", "Price", "Total"])
-    df.loc["Subtotal"] = ["", "", "", df["Total"].sum()]
-    df.loc["Tax (6%)"] = ["", "", "", df["Total"].sum() * TAX_RATE]
-    df.loc["Grand Total"] = ["", "", "", df["Total"].sum() * (1 + TAX_RATE)]
-    csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
-    return csv_buffer.getvalue()
-
-def generate_invoice_pdf(cart):
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(200, height - 50, "🍔 Restaurant Invoice 🍕")
-
-    c.setFont("Helvetica", 12)
-    y = height - 100
-    c.drawString(50, y, "Item")
-    c.drawString(250, y, "Qty")
-    c.drawString(300, y, "Price")
-    c.drawString(400, y, "Total")
-    y -= 20
-
-    subtotal = 0
-    for item, qty in cart.items():
-        price = MENU[item]
-        total = qty * price
-        c.drawString(50, y, item)
-        c.drawString(250, y, str(qty))
-        c.drawString(300, y, f"${price:.2f}")
-        c.drawString(400, y, f"${total:.2f}")
-        subtotal += total
-        y -= 20
-
-    tax = subtotal * TAX_RATE
-    grand_total = subtotal + tax
-
-    y -= 20
-    c.drawString(300, y, "Subtotal:")
-    c.drawString(400, y, f"${subtotal:.2f}")
-    y -= 20
-    c.drawString(300, y, "Tax (6%):")
-    c.drawString(400, y, f"${tax:.2f}")
-    y -= 20
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(300, y, "Total:")
-    c.drawString(400, y, f"${grand_total:.2f}")
-
-    c.showPage()
-    c.save()
-    buffer.seek(0)
-    return buffer
+def add_to_cart(order_id, item, qty):
+    try:
+        store.add_item(order_id, item, qty, MENU.price(item))
+        return True
+    except ValueError as e:
+        st.warning(f"⚠️ {e}")
+        return False
+
+def remove_from_cart(order_id, item):
+    try:
+        store.remove_item(order_id, item)
+    except ValueError as e:
+        st.warning(f"⚠️ {e}")
+
+def advance_order(order_id, status):
+    try:
+        store.set_status(order_id, status)
+    except ValueError as e:
+        st.warning(f"⚠️ {e}")
+
+# Pricing and invoices are cached on the cart contents, so reruns that
+# don't change the cart reuse the previous results
+@st.cache_data(max_entries=256)
+def get_bill(key):
+    return price_cart(key)
+
+@st.cache_data(max_entries=256)
+def generate_invoice_csv(key):
+    return invoice_csv(get_bill(key))
+
+# PDFs are only drawn when asked for, on a shared background pool
+@st.cache_resource
+def get_invoice_renderer():
+    return InvoiceRenderer()
+
+@st.fragment(run_every=0.5)
+def invoice_progress(key):
+    """Shown while the PDF renders; reruns the page once it's ready"""
+    job = get_invoice_renderer().get(key)
+    if job is None or job.done():
+        st.rerun()
+    st.caption("⏳ Rendering PDF...")
 
 # ----------------- APP UI -----------------
 st.title("🍔 Restaurant Order & Billing App")
 st.write("Select your favorite meals and generate a bill instantly! 🎉")
 
-menu_col, cart_col = st.columns(2)
-
-# ----- MENU -----
-with menu_col:
-    st.subheader("📋 Menu")
-    for item, price in MENU.items():
-        col1, col2, col3 = st.columns([2, 1, 1])
-        with col1:
-            st.markdown(f"**{item}** - ${price:.2f}")
-        with col2:
-            qty = st.number_input(f"Qty {item}", min_value=1, max_value=10, value=1, key=f"qty_{item}")
-        with col3:
-            if st.button(f"Add {item}", key=f"btn_{item}"):
-                add_to_cart(item, qty)
-                st.success(f"✅ Added {qty} x {item} to cart")
-
-# ----- CART -----
-with cart_col:
-    st.subheader("🛒 Your Cart")
-    if not st.session_state.cart:
-        st.info("Your cart is empty.")
-    else:
-        df_cart = pd.DataFrame(
-            [(item, qty, MENU[item], qty * MENU[item]) for item, qty in st.session_state.cart.items()],
-            columns=["Item", "Quantity", "Price", "Total"]
-        )
-        st.table(df_cart)
-
-        subtotal = df_cart["Total"].sum()
-        tax = subtotal * TAX_RATE
-        total = subtotal + tax
-
-        st.metric("Subtotal", f"${subtotal:.2f}")
-        st.metric("Tax (6%)", f"${tax:.2f}")
-        st.metric("Grand Total", f"${total:.2f}")
-
-        # Download buttons
-        csv_data = generate_invoice_csv(st.session_state.cart)
-        st.download_button("📥 Download Invoice (CSV)", data=csv_data, file_name="invoice.csv", mime="text/csv")
-
-        pdf_data = generate_invoice_pdf(st.session_state.cart)
-        st.download_button("📥 Download Invoice (PDF)", data=pdf_data, file_name="invoice.pdf", mime="application/pdf")
+order_tab, kitchen_tab, eod_tab = st.tabs(["🧾 Orders", "👨‍🍳 Kitchen", "📊 End of Day"])
+
+with order_tab:
+    table_no = st.selectbox("🍽️ Table", range(1, NUM_TABLES + 1), format_func=lambda n: f"Table {n}")
+    order_id = store.active_order(table_no)
+    order = store.get_order(order_id) if order_id else None
+    editable = order is None or order["status"] == OPEN
+
+    menu_col, cart_col = st.columns(2)
+
+    # ----- MENU -----
+    with menu_col:
+        st.subheader("📋 Menu")
+        filter_col, search_col = st.columns(2)
+        with filter_col:
+            category = st.selectbox("Category", ["All"] + MENU.categories())
+        with search_col:
+            query = st.text_input("🔍 Search menu")
+        names = MENU.search(query, None if category == "All" else category)
+
+        # One grid for the whole menu; quantities are only sent when the form is submitted
+        with st.form("menu_form", clear_on_submit=True):
+            picked = st.data_editor(
+                menu_table(tuple(names), MENU.version, date.today()),
+                column_config={
+                    "Price": st.column_config.NumberColumn(format="$%.2f"),
+                    "Qty": st.column_config.NumberColumn(min_value=0, max_value=50, step=1),
+                },
+                disabled=["Item", "Category", "Price"],
+                hide_index=True,
+                use_container_width=True,
+            )
+            if st.form_submit_button("➕ Add to Order", disabled=not editable):
+                picked = picked[picked["Qty"] > 0]
+                if picked.empty:
+                    st.warning("⚠️ Set a quantity for at least one item.")
+                else:
+                    order_id = order_id or store.open_order(table_no)
+                    if all(add_to_cart(order_id, row.Item, int(row.Qty)) for row in picked.itertuples()):
+                        st.rerun()
+
+    # ----- CART -----
+    with cart_col:
+        st.subheader(f"🛒 Table {table_no}")
+        items = order["items"] if order else {}
+        if not items:
+            st.info("No items ordered yet.")
+        else:
+            st.caption(f"Order #{order_id} · {order['status']}")
+            key = order_key(items)
+            bill = get_bill(key)
+            st.table(bill_table(bill))
+
+            if editable:
+                remove_item = st.selectbox("Remove item", list(items))
+                if st.button("🗑️ Remove"):
+                    remove_from_cart(order_id, remove_item)
+                    st.rerun()
+
+            st.metric("Subtotal", f"${bill['subtotal']:.2f}")
+            st.metric(f"Tax ({TAX_RATE:.0%})", f"${bill['tax']:.2f}")
+            st.metric("Grand Total", f"${bill['total']:.2f}")
+
+            # Move the order along (send to kitchen, serve, pay, cancel)
+            next_cols = st.columns(max(len(TRANSITIONS[order["status"]]), 1))
+            for col, status in zip(next_cols, TRANSITIONS[order["status"]]):
+                with col:
+                    if st.button(f"➡️ {status}", key=f"status_{status}"):
+                        advance_order(order_id, status)
+                        st.rerun()
+
+            # Invoices are built on request, so changing quantities doesn't pay for them
+            renderer = get_invoice_renderer()
+            if st.button("🧾 Prepare Invoice"):
+                renderer.submit(key, bill)
+                st.session_state.invoice_key = key
+
+            if st.session_state.invoice_key == key:
+                csv_data = generate_invoice_csv(key)
+                st.download_button("📥 Download Invoice (CSV)", data=csv_data, file_name="invoice.csv", mime="text/csv")
+
+                # Never wait on the render here: the page shows progress until the job is done
+                job = renderer.get(key) or renderer.submit(key, bill)
+                if job.done():
+                    st.download_button("📥 Download Invoice (PDF)", data=job.result(), file_name="invoice.pdf",
+                                       mime="application/pdf")
+                else:
+                    invoice_progress(key)
+            elif st.session_state.invoice_key is not None:
+                st.caption("Cart changed since the last invoice, prepare it again to download.")
+
+# ----- KITCHEN DISPLAY -----
+with kitchen_tab:
+    st.subheader("👨‍🍳 Kitchen Display")
+    if st.button("🔄 Refresh"):
+        st.rerun()
+
+    tickets = store.open_orders([IN_KITCHEN, READY])
+    if not tickets:
+        st.info("No orders in the kitchen.")
+    for ticket in tickets:
+        with st.container(border=True):
+            st.markdown(f"**Table {ticket['table_no']}** · Order #{ticket['id']} · {ticket['status']} · since {ticket['created_at'][11:]}")
+            for item, (qty, _) in ticket["items"].items():
+                st.write(f"{qty} x {item}")
+            next_status = TRANSITIONS[ticket["status"]][0]
+            if st.button(f"➡️ {next_status}", key=f"kitchen_{ticket['id']}"):
+                advance_order(ticket["id"], next_status)
+                st.rerun()
+
+# ----- END OF DAY -----
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def offer_file(name, label, file_name, mime):
+    """Show a download button for a file this session built earlier (read only when clicked)"""
+    path = st.session_state.eod_files.get(name)
+    if path and os.path.exists(path):
+        st.download_button(label, data=partial(read_file, path), file_name=file_name, mime=mime, key=f"dl_{name}")
+
+def drop_file(name):
+    """Delete a file this session built earlier, before building its replacement"""
+    path = st.session_state.eod_files.pop(name, None)
+    if path and os.path.exists(path):
+        os.remove(path)
+
+with eod_tab:
+    st.subheader("📊 End of Day")
+    day = st.date_input("Business day")
+    st.caption("Only paid orders are included.")
+
+    sales_col, invoices_col = st.columns(2)
+    with sales_col:
+        sales_format = st.selectbox("Sales export format", list(EXPORT_FORMATS))
+        if st.button("⚙️ Export Sales"):
+            drop_file("sales")
+            with st.spinner("Exporting sales..."):
+                try:
+                    st.session_state.eod_files["sales"] = export_sales(store, day, sales_format)
+                    st.session_state.eod_files["sales_format"] = sales_format
+                except RuntimeError as e:
+                    st.error(f"⚠️ {e}")
+        fmt = st.session_state.eod_files.get("sales_format", "CSV")
+        offer_file("sales", f"📥 Download Sales ({fmt})", f"sales_{day}{EXPORT_FORMATS[fmt]['suffix']}",
+                   EXPORT_FORMATS[fmt]["mime"])
+
+    with invoices_col:
+        if st.button("🧾 Batch Invoices (ZIP)"):
+            drop_file("invoices")
+            with st.spinner("Rendering invoices..."):
+                path, count = batch_invoices_zip(store, day, statuses=(PAID,))
+            st.session_state.eod_files["invoices"] = path
+            st.success(f"Rendered {count} invoices.")
+        offer_file("invoices", "📥 Download Invoices (ZIP)", f"invoices_{day}.zip", "application/zip")
@@ -0,0 +1,185 @@
+"""Benchmarks for the day12 tic-tac-toe engine.
+
+    python day12_bench.py positions --positions 2000000
+    python day12_bench.py handler --think-time 2 --p99-ms 250
+"""
+import argparse
+import random
+import threading
+import time
+from day12_engine import FULL, WIN_TABLE, computer_move, empty_cells, play, to_grid
+
+
+def list_check_winner(board):
+    """The original nested-list winner check, kept here as the baseline"""
+    for i in range(3):
+        if board[i][0] == board[i][1] == board[i][2] != '':
+            return board[i][0]
+    for j in range(3):
+        if board[0][j] == board[1][j] == board[2][j] != '':
+            return board[0][j]
+    if board[0][0] == board[1][1] == board[2][2] != '':
+        return board[0][0]
+    if board[0][2] == board[1][1] == board[2][0] != '':
+        return board[0][2]
+    return None
+
+
+def random_positions(count, seed=0):
+    """Random (x, o) bitboards with no overlapping cells"""
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        x = rng.getrandbits(9)
+        positions.append((x, rng.getrandbits(9) & ~x & FULL))
+    return positions
+
+
+def bench_positions(count):
+    positions = random_positions(count)
+
+    start = time.perf_counter()
+    wins = 0
+    for x, o in positions:
+        if WIN_TABLE[x] or WIN_TABLE[o] or x | o == FULL:
+            wins += 1
+    bitboard_s = time.perf_counter() - start
+
+    sample = positions[:min(count, 200_000)]
+    grids = [to_grid(x, o) for x, o in sample]
+    start = time.perf_counter()
+    for grid in grids:
+        list_check_winner(grid) or all(grid[i][j] != '' for i in range(3) for j in range(3))
+    list_s = time.perf_counter() - start
+
+    print(f"{count:,} random positions (win + full-board check)")
+    print(f"  bitboard:    {count / bitboard_s:14,.0f} positions/s")
+    print(f"  nested list: {len(grids) / list_s:14,.0f} positions/s (on {len(grids):,})")
+
+
+def handle_move(x, o, rng, delay=0.0):
+    """One "vs Computer" click: the player's move, an optional server-side pause, the computer's reply"""
+    x, o, result = play(x, o, 'X', rng.choice(empty_cells(x, o)))
+    if result:
+        return 0, 0
+    if delay:
+        time.sleep(delay)  # what make_move used to do before replying
+    x, o, result = play(x, o, 'O', computer_move(x, o, 'O', "Hard", rng))
+    return (0, 0) if result else (x, o)
+
+
+def run_games(games, seconds, delay, think_time):
+    """Play `games` concurrent games (one thread each, like Streamlit sessions) for `seconds`
+
+    Each player waits about `think_time` seconds between clicks. Returns the
+    sorted click latencies (seconds).
+    """
+    latencies = []
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def client(seed):
+        rng = random.Random(seed)
+        x = o = 0
+        mine = []
+        time.sleep(rng.uniform(0, think_time))  # players don't all click at the same moment
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            x, o = handle_move(x, o, rng, delay)
+            mine.append(time.perf_counter() - start)
+            time.sleep(rng.uniform(0.5, 1.5) * think_time)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(games)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return latencies
+
+
+def percentile_ms(latencies, fraction):
+    return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000
+
+
+def find_capacity(delay, seconds, think_time, target_ms, start_games, max_games):
+    """Most concurrent games whose p99 click latency stays within target_ms
+
+    Doubles the number of games (up to max_games) until p99 goes over the
+    target, then bisects between the last good and the first bad count.
+    Returns (capacity, {games: (p50 ms, p99 ms)} for every step run);
+    capacity is None if even start_games misses the target.
+    """
+    results = {}
+
+    def measure(games):
+        latencies = run_games(games, seconds, delay, think_time)
+        p50, p99 = percentile_ms(latencies, 0.5), percentile_ms(latencies, 0.99)
+        print(f"    {games:6,} games   {len(latencies) / seconds:8,.0f} moves/s   p50 {p50:8.2f} ms   p99 {p99:8.2f} ms")
+        results[games] = (p50, p99)
+        return p99 <= target_ms
+
+    good, bad = None, None
+    games = min(start_games, max_games)
+    while good != max_games:
+        if not measure(games):
+            bad = games
+            break
+        good = games
+        games = min(games * 2, max_games)
+    if good is None or bad is None:
+        return good, results
+    while bad - good > max(good // 10, 1):
+        middle = (good + bad) // 2
+        if measure(middle):
+            good = middle
+        else:
+            bad = middle
+    return good, results
+
+
+def bench_handler(seconds, think_time, target_ms, start_games, max_games):
+    print(f"Games a server holds with p99 click latency <= {target_ms:g} ms "
+          f"({think_time}s think time, {seconds}s per step)")
+    summary = []
+    for label, delay in [("before (0.5s server sleep)", 0.5), ("after (no server sleep)", 0.0)]:
+        print(f"  {label}")
+        capacity, results = find_capacity(delay, seconds, think_time, target_ms, start_games, max_games)
+        if capacity is None:
+            verdict = f"misses the target even at {start_games:,} games"
+        elif capacity >= max_games:
+            verdict = f"within the target at {capacity:,} games (the most tried; raise --max-games)"
+        else:
+            verdict = f"{capacity:,} games"
+        print(f"    -> {verdict}")
+        summary.append((label, verdict, results[min(results)]))
+    # Both paths always run the first step, so their latencies there compare like for like
+    print(f"Summary (latency at {min(start_games, max_games):,} games)")
+    for label, verdict, (p50, p99) in summary:
+        print(f"  {label:28s} p50 {p50:8.2f} ms   p99 {p99:8.2f} ms   capacity: {verdict}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="day12 engine benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    positions = sub.add_parser("positions", help="win/full checks per second")
+    positions.add_argument("--positions", type=int, default=2_000_000)
+    handler = sub.add_parser("handler", help="how many concurrent games fit a p99 latency target, with and without the server-side sleep")
+    handler.add_argument("--seconds", type=float, default=10, help="length of each step")
+    handler.add_argument("--think-time", type=float, default=2.0)
+    handler.add_argument("--p99-ms", type=float, default=250,
+                         help="p99 click latency target (keep it under the old 0.5s sleep to see the difference)")
+    handler.add_argument("--start-games", type=int, default=50)
+    handler.add_argument("--max-games", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.bench == "positions":
+        bench_positions(args.positions)
+    elif args.bench == "handler":
+        bench_handler(args.seconds, args.think_time, args.p99_ms, args.start_games, args.max_games)
+
+
+if __name__ == "__main__":
+    main()
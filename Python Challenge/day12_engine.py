@@ -0,0 +1,246 @@
+"""Bitboard tic-tac-toe engine.
+
+Each player's marks are a 9-bit integer, bit (row * 3 + col) set when that
+player holds the cell. Wins are checked with precomputed line masks; on top
+of that WIN_TABLE maps all 512 possible bitboards to their winning line, so
+"did X win?" is a single list lookup.
+"""
+import random
+
+SIZE = 3
+FULL = (1 << 9) - 1
+
+# The 8 winning lines as bit masks
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+]
+
+# WIN_TABLE[bits] -> first winning mask contained in bits, or 0
+WIN_TABLE = [next((m for m in WIN_MASKS if bits & m == m), 0) for bits in range(1 << 9)]
+
+
+def bit(row, col):
+    """Bit for a cell"""
+    return 1 << (row * SIZE + col)
+
+
+def cells_of(mask):
+    """[(row, col), ...] of the set bits of a mask"""
+    return [divmod(i, SIZE) for i in range(9) if mask >> i & 1]
+
+
+def winner(x, o):
+    """Return ('X' or 'O', winning cells) or (None, [])"""
+    if WIN_TABLE[x]:
+        return 'X', cells_of(WIN_TABLE[x])
+    if WIN_TABLE[o]:
+        return 'O', cells_of(WIN_TABLE[o])
+    return None, []
+
+
+def has_won(bits):
+    """True if these marks contain a full line"""
+    return WIN_TABLE[bits] != 0
+
+
+def is_full(x, o):
+    """True if every cell is taken"""
+    return x | o == FULL
+
+
+def empty_cells(x, o):
+    """Indexes (0-8) of free cells"""
+    free = ~(x | o) & FULL
+    return [i for i in range(9) if free >> i & 1]
+
+
+def cell_value(x, o, row, col):
+    """'X', 'O' or '' for one cell"""
+    b = bit(row, col)
+    return 'X' if x & b else 'O' if o & b else ''
+
+
+def from_grid(grid):
+    """Nested list of 'X'/'O'/'' -> (x, o) bitboards"""
+    x = o = 0
+    for r in range(SIZE):
+        for c in range(SIZE):
+            if grid[r][c] == 'X':
+                x |= bit(r, c)
+            elif grid[r][c] == 'O':
+                o |= bit(r, c)
+    return x, o
+
+
+def to_grid(x, o):
+    """(x, o) bitboards -> nested list of 'X'/'O'/''"""
+    return [[cell_value(x, o, r, c) for c in range(SIZE)] for r in range(SIZE)]
+
+
+def play(x, o, player, index):
+    """Place `player`'s mark on cell `index`; returns (x, o, result)
+
+    result is 'X' or 'O' for a win, 'Draw' for a full board, or None if the
+    game goes on. Raises ValueError if the cell is taken.
+    """
+    b = 1 << index
+    if (x | o) & b:
+        raise ValueError(f"Cell {index} is already taken")
+    if player == 'X':
+        x |= b
+        if WIN_TABLE[x]:
+            return x, o, 'X'
+    else:
+        o |= b
+        if WIN_TABLE[o]:
+            return x, o, 'O'
+    return x, o, 'Draw' if x | o == FULL else None
+
+
+# ----------------- SYMMETRY -----------------
+def _symmetries():
+    """The 8 rotations/reflections of the board as cell-index permutations"""
+    perms = []
+    for k in range(4):
+        for flip in (False, True):
+            perm = []
+            for i in range(9):
+                r, c = divmod(i, SIZE)
+                for _ in range(k):
+                    r, c = c, SIZE - 1 - r
+                if flip:
+                    c = SIZE - 1 - c
+                perm.append(r * SIZE + c)
+            perms.append(perm)
+    return perms
+
+
+# PERM_TABLES[s][bits] -> bits after applying symmetry s
+PERM_TABLES = [
+    [sum(1 << perm[i] for i in range(9) if bits >> i & 1) for bits in range(1 << 9)]
+    for perm in _symmetries()
+]
+
+
+def canonical_key(me, opp):
+    """Same key for all 8 symmetric versions of a position (from the mover's point of view)"""
+    return min(table[me] << 9 | table[opp] for table in PERM_TABLES)
+
+
+# ----------------- PERFECT PLAY -----------------
+EXACT, LOWER, UPPER = 0, 1, 2
+MOVE_ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]  # center, corners, edges: good moves first prune more
+
+# canonical key -> (score, flag); filled once at import, reused by every game
+TRANSPOSITION_TABLE = {}
+
+
+def _free_count(me, opp):
+    return 9 - bin(me | opp).count("1")
+
+
+def _negamax(me, opp, alpha, beta):
+    """Score for the player to move (owning `me`): >0 win, 0 draw, <0 loss; faster wins score higher"""
+    if WIN_TABLE[opp]:
+        return -(1 + _free_count(me, opp))
+    if me | opp == FULL:
+        return 0
+
+    key = canonical_key(me, opp)
+    entry = TRANSPOSITION_TABLE.get(key)
+    if entry is not None:
+        score, flag = entry
+        if flag == EXACT or (flag == LOWER and score >= beta) or (flag == UPPER and score <= alpha):
+            return score
+
+    alpha_orig = alpha
+    best = -100
+    taken = me | opp
+    for i in MOVE_ORDER:
+        if taken >> i & 1:
+            continue
+        score = -_negamax(opp, me | 1 << i, -beta, -alpha)
+        if score > best:
+            best = score
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            break
+
+    flag = UPPER if best <= alpha_orig else LOWER if best >= beta else EXACT
+    TRANSPOSITION_TABLE[key] = (best, flag)
+    return best
+
+
+def move_scores(x, o, player):
+    """{cell index: exact score for `player` after playing there}"""
+    me, opp = (x, o) if player == 'X' else (o, x)
+    return {i: -_negamax(opp, me | 1 << i, -100, 100) for i in empty_cells(x, o)}
+
+
+def best_moves(x, o, player):
+    """All cell indexes that play perfectly for `player`"""
+    scores = move_scores(x, o, player)
+    if not scores:
+        return []
+    top = max(scores.values())
+    return [i for i, score in scores.items() if score == top]
+
+
+def winning_move(mine, theirs):
+    """A cell that completes a line for `mine`, or None"""
+    for i in empty_cells(mine, theirs):
+        if WIN_TABLE[mine | 1 << i]:
+            return i
+    return None
+
+
+# ----------------- COMPUTER PLAYERS -----------------
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def computer_move(x, o, player='O', difficulty="Hard", rng=random):
+    """Pick a cell index for the computer, or None if the board is full
+
+    Easy plays randomly, Medium wins or blocks when it can and otherwise
+    plays randomly, Hard plays perfectly (minimax with alpha-beta pruning
+    over the symmetry-aware transposition table).
+    """
+    free = empty_cells(x, o)
+    if not free:
+        return None
+    if difficulty == "Easy":
+        return rng.choice(free)
+
+    mine, theirs = (x, o) if player == 'X' else (o, x)
+    if difficulty == "Medium":
+        move = winning_move(mine, theirs)
+        if move is None:
+            move = winning_move(theirs, mine)
+        return move if move is not None else rng.choice(free)
+
+    return rng.choice(best_moves(x, o, player))
+
+
+def _warm_up():
+    """Score every move of every reachable position once, so games only hit the table"""
+    seen = set()
+    stack = [(0, 0, 'X')]
+    while stack:
+        x, o, player = stack.pop()
+        key = (x, o)
+        if key in seen or WIN_TABLE[x] or WIN_TABLE[o]:
+            continue
+        seen.add(key)
+        move_scores(x, o, player)
+        for i in empty_cells(x, o):
+            if player == 'X':
+                stack.append((x | 1 << i, o, 'O'))
+            else:
+                stack.append((x, o | 1 << i, 'X'))
+
+
+# Solve the whole game once at import so every later move is table lookups
+_warm_up()
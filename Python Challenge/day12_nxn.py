@@ -0,0 +1,194 @@
+"""N x N, K-in-a-row tic-tac-toe (up to gomoku on 15 x 15).
+
+Boards use the same representation as day12_engine: one integer per player,
+bit (row * size + col) set for each mark. Instead of scanning every line,
+a move only checks the four lines running through the cell just played.
+The 3 x 3, 3-in-a-row case is handed to day12_engine (lookup-table wins and
+perfect play).
+"""
+import random
+import time
+import day12_engine
+
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+WIN_SCORE = 1_000_000
+# Score for a run of n stones through a cell, by number of open ends (0, 1, 2)
+RUN_SCORES = {1: (0, 1, 5), 2: (0, 10, 50), 3: (0, 100, 1_000), 4: (0, 5_000, 50_000)}
+
+
+class _Timeout(Exception):
+    pass
+
+
+class Board:
+    """Rules and AI for a size x size board where k in a row wins"""
+
+    def __init__(self, size=3, k=3):
+        if not 3 <= k <= size:
+            raise ValueError("Win length must be between 3 and the board size")
+        self.size = size
+        self.k = k
+        self.full = (1 << size * size) - 1
+        self.classic = size == 3 and k == 3
+
+    # ----- rules -----
+    def index(self, row, col):
+        return row * self.size + col
+
+    def cell_value(self, x, o, row, col):
+        """'X', 'O' or '' for one cell"""
+        b = 1 << self.index(row, col)
+        return 'X' if x & b else 'O' if o & b else ''
+
+    def empty_cells(self, x, o):
+        taken = x | o
+        return [i for i in range(self.size * self.size) if not taken >> i & 1]
+
+    def _on_board(self, r, c):
+        return 0 <= r < self.size and 0 <= c < self.size
+
+    def _run(self, bits, row, col, dr, dc):
+        """Length of the run of `bits` through (row, col) along (dr, dc), and the cells just past each end"""
+        length = 1
+        ends = []
+        for sign in (1, -1):
+            r, c = row + sign * dr, col + sign * dc
+            while self._on_board(r, c) and bits >> (r * self.size + c) & 1:
+                length += 1
+                r, c = r + sign * dr, c + sign * dc
+            ends.append((r, c))
+        return length, ends
+
+    def winning_line(self, bits, index):
+        """Winning cells through the mark at `index`, or [] (only the 4 lines through it are checked)"""
+        row, col = divmod(index, self.size)
+        for dr, dc in DIRECTIONS:
+            length, ends = self._run(bits, row, col, dr, dc)
+            if length >= self.k:
+                r, c = ends[1]
+                return [(r + n * dr, c + n * dc) for n in range(1, length + 1)]
+        return []
+
+    def play(self, x, o, player, index):
+        """Place `player`'s mark on cell `index`; returns (x, o, result) like day12_engine.play"""
+        if self.classic:
+            return day12_engine.play(x, o, player, index)
+        b = 1 << index
+        if (x | o) & b:
+            raise ValueError(f"Cell {index} is already taken")
+        if player == 'X':
+            x |= b
+            if self.winning_line(x, index):
+                return x, o, 'X'
+        else:
+            o |= b
+            if self.winning_line(o, index):
+                return x, o, 'O'
+        return x, o, 'Draw' if x | o == self.full else None
+
+    # ----- move evaluation -----
+    def _move_value(self, mine, theirs, index):
+        """Heuristic value of `mine` playing `index`: runs it makes, weighted by open ends"""
+        row, col = divmod(index, self.size)
+        bits = mine | 1 << index
+        taken = bits | theirs
+        total = 0
+        for dr, dc in DIRECTIONS:
+            length, ends = self._run(bits, row, col, dr, dc)
+            if length >= self.k:
+                return WIN_SCORE
+            open_ends = sum(1 for r, c in ends if self._on_board(r, c) and not taken >> (r * self.size + c) & 1)
+            # Runs count relative to the win length, so 4 of 5 scores like 2 of 3
+            level = max(1, min(4, length + 5 - self.k))
+            total += RUN_SCORES[level][open_ends]
+        return total
+
+    def _candidates(self, x, o, player, width):
+        """Free cells near existing marks, best-looking first (attack plus blocking value)"""
+        taken = x | o
+        if not taken:
+            centre = self.size // 2
+            return [self.index(centre, centre)]
+        mine, theirs = (x, o) if player == 'X' else (o, x)
+        near = set()
+        for i in range(self.size * self.size):
+            if taken >> i & 1:
+                r, c = divmod(i, self.size)
+                for rr in range(max(r - 2, 0), min(r + 3, self.size)):
+                    for cc in range(max(c - 2, 0), min(c + 3, self.size)):
+                        j = rr * self.size + cc
+                        if not taken >> j & 1:
+                            near.add(j)
+        scored = sorted(
+            ((self._move_value(mine, theirs, i) + 0.9 * self._move_value(theirs, mine, i), i) for i in near),
+            reverse=True,
+        )
+        return [i for _, i in scored[:width]]
+
+    def _evaluate(self, x, o, player):
+        """Static score for the player to move: their best threat against the opponent's best"""
+        mine, theirs = (x, o) if player == 'X' else (o, x)
+        free = self._candidates(x, o, player, width=8)
+        best_mine = max((self._move_value(mine, theirs, i) for i in free), default=0)
+        best_theirs = max((self._move_value(theirs, mine, i) for i in free), default=0)
+        return best_mine - 0.9 * best_theirs
+
+    def _search(self, x, o, player, depth, alpha, beta, deadline, width):
+        if time.perf_counter() > deadline:
+            raise _Timeout
+        if x | o == self.full:
+            return 0, None
+        if depth == 0:
+            return self._evaluate(x, o, player), None
+
+        other = 'O' if player == 'X' else 'X'
+        best_score, best_move = -float("inf"), None
+        for i in self._candidates(x, o, player, width):
+            nx, no, result = self.play(x, o, player, i)
+            if result == player:
+                return WIN_SCORE + depth, i  # win now; sooner wins score higher
+            if result == 'Draw':
+                score = 0
+            else:
+                score = -self._search(nx, no, other, depth - 1, -beta, -alpha, deadline, width)[0]
+            if score > best_score:
+                best_score, best_move = score, i
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best_score, best_move
+
+    def search_move(self, x, o, player, time_budget=1.0, max_depth=6, width=10):
+        """Iterative deepening alpha-beta: deepen one ply at a time until the time budget runs out
+
+        Returns (move, depth reached). The move from the last fully searched
+        depth is used, so there is always an answer.
+        """
+        deadline = time.perf_counter() + time_budget
+        candidates = self._candidates(x, o, player, width)
+        best, reached = candidates[0] if candidates else None, 0
+        for depth in range(1, max_depth + 1):
+            try:
+                score, move = self._search(x, o, player, depth, -float("inf"), float("inf"), deadline, width)
+            except _Timeout:
+                break
+            if move is not None:
+                best, reached = move, depth
+            if score >= WIN_SCORE:
+                break  # found a forced win, no need to look deeper
+        return best, reached
+
+    # ----- computer players -----
+    def computer_move(self, x, o, player='O', difficulty="Hard", rng=random, time_budget=1.0):
+        """Cell index for the computer (None on a full board), same difficulties as day12_engine"""
+        if self.classic:
+            return day12_engine.computer_move(x, o, player, difficulty, rng)
+        free = self.empty_cells(x, o)
+        if not free:
+            return None
+        if difficulty == "Easy":
+            return rng.choice(self._candidates(x, o, player, width=len(free)))
+        if difficulty == "Medium":
+            return self._candidates(x, o, player, width=1)[0]
+        return self.search_move(x, o, player, time_budget)[0]
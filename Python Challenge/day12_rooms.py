@@ -0,0 +1,189 @@
+"""Shared tic-tac-toe rooms for playing across browsers.
+
+Rooms live in one in-process store shared by every Streamlit session, and can
+optionally be written through to SQLite so they survive a restart. Each room
+has a version number that goes up on every change, so a session waiting on
+the other player only has to compare one number to know whether to redraw.
+"""
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from day12_nxn import Board
+
+CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"  # no 0/O or 1/I to misread
+CODE_LENGTH = 5
+ROOM_TTL = 2 * 60 * 60  # rooms idle this long (seconds) are removed
+
+
+def normalize_code(code):
+    """Room codes are case-insensitive and ignore surrounding spaces"""
+    return (code or "").strip().upper()
+
+
+def _new_game(room):
+    room["x"] = room["o"] = 0
+    room["turn"] = 'X'
+    room["result"] = None
+    room["winning_line"] = []
+
+
+class RoomStore:
+    """Game rooms shared by all sessions, optionally backed by a SQLite file"""
+
+    def __init__(self, path=None, ttl=ROOM_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._rooms = {}
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            if path != ":memory:":
+                self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS rooms (
+                    code TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self.conn.commit()
+            for code, state in self.conn.execute("SELECT code, state FROM rooms"):
+                self._rooms[code] = json.loads(state)
+
+    # ----- helpers (callers hold self._lock) -----
+    def _room(self, code):
+        room = self._rooms.get(normalize_code(code))
+        if room is None:
+            raise ValueError(f"Room {normalize_code(code)} does not exist")
+        return room
+
+    def _save(self, room):
+        """Bump the version and write through to SQLite"""
+        room["version"] += 1
+        room["updated_at"] = time.time()
+        if self.conn is not None:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO rooms (code, state, updated_at) VALUES (?, ?, ?)",
+                    (room["code"], json.dumps(room), room["updated_at"]),
+                )
+
+    def _purge_idle(self):
+        cutoff = time.time() - self.ttl
+        for code in [c for c, room in self._rooms.items() if room["updated_at"] < cutoff]:
+            del self._rooms[code]
+            if self.conn is not None:
+                with self.conn:
+                    self.conn.execute("DELETE FROM rooms WHERE code = ?", (code,))
+
+    @staticmethod
+    def _snapshot(room):
+        return json.loads(json.dumps(room))
+
+    # ----- rooms -----
+    def create_room(self, token, size=3, k=3):
+        """Open a new room with `token` playing X; returns the room code"""
+        Board(size, k)  # raises ValueError for a bad size / win length
+        with self._lock:
+            self._purge_idle()
+            code = "".join(secrets.choice(CODE_ALPHABET) for _ in range(CODE_LENGTH))
+            while code in self._rooms:
+                code = "".join(secrets.choice(CODE_ALPHABET) for _ in range(CODE_LENGTH))
+            room = {
+                "code": code, "size": size, "k": k,
+                "players": {'X': token, 'O': None},
+                "scores": {'X': 0, 'O': 0, 'Draws': 0},
+                "version": 0, "updated_at": 0,
+            }
+            _new_game(room)
+            self._rooms[code] = room
+            self._save(room)
+            return code
+
+    def join(self, code, token):
+        """Take a seat in a room: returns 'X' or 'O', or None when both seats are taken (spectating)
+
+        A player who already holds a seat gets it back; otherwise the first
+        free seat is taken, X before O, so a seat someone left can be refilled.
+        """
+        with self._lock:
+            room = self._room(code)
+            for side, player in room["players"].items():
+                if player == token:
+                    return side
+            for side in ('X', 'O'):
+                if room["players"][side] is None:
+                    room["players"][side] = token
+                    self._save(room)
+                    return side
+            return None
+
+    def leave(self, code, token):
+        """Give up a seat so someone else can join"""
+        with self._lock:
+            room = self._rooms.get(normalize_code(code))
+            if room is None:
+                return
+            for side, player in room["players"].items():
+                if player == token:
+                    room["players"][side] = None
+                    self._save(room)
+
+    def get(self, code):
+        """Copy of a room's state, or None"""
+        with self._lock:
+            room = self._rooms.get(normalize_code(code))
+            return self._snapshot(room) if room is not None else None
+
+    def count(self):
+        with self._lock:
+            return len(self._rooms)
+
+    # ----- moves -----
+    def move(self, code, token, index):
+        """Play cell `index` for whichever side `token` holds; returns the updated room
+
+        Raises ValueError if the game is over, it's not this player's turn or the cell is taken.
+        """
+        with self._lock:
+            room = self._room(code)
+            if room["result"] is not None:
+                raise ValueError("This game is over, start a new round")
+            player = room["turn"]
+            if room["players"][player] != token:
+                raise ValueError("It's not your turn")
+            board = Board(room["size"], room["k"])
+            room["x"], room["o"], result = board.play(room["x"], room["o"], player, index)
+            if result is None:
+                room["turn"] = 'O' if player == 'X' else 'X'
+            else:
+                room["result"] = result
+                if result == 'Draw':
+                    room["scores"]['Draws'] += 1
+                else:
+                    room["winning_line"] = board.winning_line(room["x"] if result == 'X' else room["o"], index)
+                    room["scores"][result] += 1
+            self._save(room)
+            return self._snapshot(room)
+
+    def new_round(self, code, token, clear_scores=False, only_if_over=False):
+        """Clear the board (and optionally the scores); only the room's players can
+
+        With only_if_over the board is left alone unless the game has finished,
+        so both players pressing New Round after a game starts it just once.
+        """
+        with self._lock:
+            room = self._room(code)
+            if token not in room["players"].values():
+                raise ValueError("Only the players can start a new round")
+            if only_if_over and room["result"] is None:
+                return self._snapshot(room)
+            _new_game(room)
+            if clear_scores:
+                room["scores"] = {'X': 0, 'O': 0, 'Draws': 0}
+            self._save(room)
+            return self._snapshot(room)
+
@@ -0,0 +1,159 @@
+"""Headless self-play tournaments for the day12 tic-tac-toe computer players.
+
+    python day12_selfplay.py random hard --games 1000000
+    python day12_selfplay.py medium hard --size 7 --k 4 --games 200 --time-budget 0.05
+
+Games are split into chunks and played across a process pool. Each game uses
+the same Board.play rules as the app, the two strategies swap sides every
+other game, and every move is timed. Latencies go into a log-scale histogram
+per worker (about 9% wide buckets), so millions of moves merge cheaply and
+percentiles come out of the merged histogram.
+"""
+import argparse
+import math
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from day12_nxn import Board
+
+BUCKETS_PER_DOUBLING = 8
+
+
+# ----------------- STRATEGIES -----------------
+def random_strategy(board, x, o, player, rng, time_budget):
+    return rng.choice(board.empty_cells(x, o))
+
+
+def difficulty_strategy(difficulty):
+    """Strategy that plays like the app's computer at `difficulty`"""
+    def strategy(board, x, o, player, rng, time_budget):
+        return board.computer_move(x, o, player, difficulty, rng, time_budget)
+    return strategy
+
+
+# name -> function(board, x, o, player, rng, time_budget) returning a cell index
+# Register new computer players here to make them available on the command line.
+STRATEGIES = {
+    "random": random_strategy,
+    "easy": difficulty_strategy("Easy"),
+    "medium": difficulty_strategy("Medium"),
+    "hard": difficulty_strategy("Hard"),
+    "minimax": difficulty_strategy("Hard"),  # perfect play on 3 x 3, depth-limited search on bigger boards
+}
+
+
+# ----------------- GAMES -----------------
+def _bucket(seconds):
+    return int(math.log2(max(seconds, 1e-9)) * BUCKETS_PER_DOUBLING)
+
+
+def play_game(board, x_strategy, o_strategy, rng, time_budget=1.0, latencies=None):
+    """Play one game to the end; returns 'X', 'O' or 'Draw'
+
+    If `latencies` (a Counter) is given, each move's time is added to it as a histogram bucket.
+    """
+    x = o = 0
+    player, strategy, other = 'X', x_strategy, o_strategy
+    while True:
+        start = time.perf_counter()
+        move = strategy(board, x, o, player, rng, time_budget)
+        if latencies is not None:
+            latencies[_bucket(time.perf_counter() - start)] += 1
+        x, o, result = board.play(x, o, player, move)
+        if result is not None:
+            return result
+        player = 'O' if player == 'X' else 'X'
+        strategy, other = other, strategy
+
+
+def play_chunk(size, k, first, second, games, seed, offset, time_budget):
+    """Worker: play `games` games and return (results, latency histogram)
+
+    results counts 'first', 'second' and 'draw', plus wins by side. `first`
+    plays X in games with an even number (offset + n), so chunks alternate
+    sides the same way however the games are split.
+    """
+    board = Board(size, k)
+    rng = random.Random(seed)
+    strategies = STRATEGIES[first], STRATEGIES[second]
+    results, latencies = Counter(), Counter()
+    for n in range(offset, offset + games):
+        first_is_x = n % 2 == 0
+        x_strategy, o_strategy = strategies if first_is_x else strategies[::-1]
+        result = play_game(board, x_strategy, o_strategy, rng, time_budget, latencies)
+        if result == 'Draw':
+            results["draw"] += 1
+        else:
+            results[f"{result} wins"] += 1
+            results["first" if (result == 'X') == first_is_x else "second"] += 1
+    return results, latencies
+
+
+def percentile(histogram, q):
+    """Approximate q-th percentile (in seconds) from a latency histogram"""
+    total = sum(histogram.values())
+    if not total:
+        return 0.0
+    target = q / 100 * total
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= target:
+            # Upper edge of the bucket
+            return 2 ** ((bucket + 1) / BUCKETS_PER_DOUBLING)
+    return 2 ** ((max(histogram) + 1) / BUCKETS_PER_DOUBLING)
+
+
+def run_tournament(first, second, games, size=3, k=3, workers=None, chunk_size=10_000, seed=0, time_budget=1.0):
+    """Play `games` games across a process pool; returns (results, latency histogram, seconds)"""
+    Board(size, k)  # fail fast on a bad size / k
+    for name in (first, second):
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {name!r}, choose from {', '.join(STRATEGIES)}")
+
+    chunks = []
+    for offset in range(0, games, chunk_size):
+        chunks.append((size, k, first, second, min(chunk_size, games - offset), seed + offset, offset, time_budget))
+
+    results, latencies = Counter(), Counter()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_results, chunk_latencies in pool.map(play_chunk, *zip(*chunks)):
+            results.update(chunk_results)
+            latencies.update(chunk_latencies)
+    return results, latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="day12 computer vs computer tournaments")
+    parser.add_argument("first", choices=list(STRATEGIES))
+    parser.add_argument("second", choices=list(STRATEGIES))
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--size", type=int, default=3, help="board size")
+    parser.add_argument("--k", type=int, default=3, help="marks in a row to win")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="games per worker task")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-budget", type=float, default=1.0, help="seconds per move for search on big boards")
+    args = parser.parse_args()
+
+    results, latencies, seconds = run_tournament(
+        args.first, args.second, args.games, args.size, args.k,
+        args.workers, args.chunk_size, args.seed, args.time_budget,
+    )
+    moves = sum(latencies.values())
+    print(f"{args.games:,} games of {args.first} vs {args.second} on {args.size} x {args.size}, "
+          f"{args.k} in a row ({args.workers} workers, sides alternate)")
+    for label, key in [(f"{args.first} (1st)", "first"), (f"{args.second} (2nd)", "second"), ("draws", "draw")]:
+        print(f"  {label:14s} {results[key]:12,}  {results[key] / args.games:7.2%}")
+    print(f"  X won {results['X wins']:,}, O won {results['O wins']:,}")
+    print(f"  {args.games / seconds:,.0f} games/s, {moves / seconds:,.0f} moves/s ({seconds:.2f}s)")
+    print("  move latency  " + "   ".join(
+        f"p{q} {percentile(latencies, q) * 1e6:,.1f} us" for q in (50, 90, 99, 99.9)
+    ))
+
+
+if __name__ == "__main__":
+    main()
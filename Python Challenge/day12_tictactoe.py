@@ -1,6 +1,14 @@
+import os
+import uuid
 import streamlit as st
-import random
-import time
+from day12_engine import DIFFICULTIES, winner
+from day12_nxn import Board
+from day12_rooms import RoomStore, normalize_code
+
+BOARD_SIZES = list(range(3, 16))
+GAME_MODES = ["Two Player", "vs Computer", "Online Room"]
+# Seconds between room version checks while waiting on the other player (their move or joining)
+WATCH_SECONDS = 1
 
 # Configure page
 st.set_page_config(
@@ -142,99 +150,168 @@ st.markdown("""
         from { background-color: #ffd700; }
         to { background-color: #ff6b6b; }
     }
+    
+    /* Computer's reply fades in after a short pause, in the browser */
+    @keyframes computer-move {
+        from { color: transparent; opacity: 0; }
+        to { opacity: 1; }
+    }
 </style>
 """, unsafe_allow_html=True)
 
 # Initialize session state
-if 'board' not in st.session_state:
-    st.session_state.board = [['' for _ in range(3)] for _ in range(3)]
+if 'x_bits' not in st.session_state:
+    # Each player's marks are an integer, bit (row * size + col) per cell (see day12_engine)
+    st.session_state.x_bits = 0
+    st.session_state.o_bits = 0
     st.session_state.current_player = 'X'
     st.session_state.game_over = False
     st.session_state.winner = None
     st.session_state.winning_line = []
-    st.session_state.game_mode = 'Two Player'
+    # A shared room link (?room=CODE) opens straight into online mode
+    st.session_state.game_mode = 'Online Room' if st.query_params.get("room") else 'Two Player'
+    st.session_state.difficulty = 'Hard'
+    st.session_state.last_computer_move = None
+    st.session_state.board_size = 3
+    st.session_state.win_length = 3
     st.session_state.scores = {'X': 0, 'O': 0, 'Draws': 0}
+    st.session_state.room_code = None
+    st.session_state.room_message = None
+    # Holds this session's seat; never put in the page link, which players share
+    st.session_state.player_token = uuid.uuid4().hex
 
-def check_winner(board):
-    """Check if there's a winner and return the winner and winning line"""
-    # Check rows
-    for i in range(3):
-        if board[i][0] == board[i][1] == board[i][2] != '':
-            return board[i][0], [(i, 0), (i, 1), (i, 2)]
-    
-    # Check columns
-    for j in range(3):
-        if board[0][j] == board[1][j] == board[2][j] != '':
-            return board[0][j], [(0, j), (1, j), (2, j)]
-    
-    # Check diagonals
-    if board[0][0] == board[1][1] == board[2][2] != '':
-        return board[0][0], [(0, 0), (1, 1), (2, 2)]
-    if board[0][2] == board[1][1] == board[2][0] != '':
-        return board[0][2], [(0, 2), (1, 1), (2, 0)]
-    
-    return None, []
+@st.cache_resource
+def get_rooms():
+    """One room store for every session (set TICTACTOE_ROOMS_DB to keep rooms in SQLite)"""
+    return RoomStore(os.environ.get("TICTACTOE_ROOMS_DB"))
+
+rooms = get_rooms()
+
+def sync_room(room):
+    """Show a room's shared state through the usual session_state game keys"""
+    st.session_state.x_bits = room['x']
+    st.session_state.o_bits = room['o']
+    st.session_state.current_player = room['turn']
+    st.session_state.game_over = room['result'] is not None
+    st.session_state.winner = room['result']
+    st.session_state.winning_line = [tuple(cell) for cell in room['winning_line']]
+    st.session_state.scores = room['scores']
+    st.session_state.board_size = room['size']
+    st.session_state.win_length = room['k']
+
+def leave_room():
+    rooms.leave(st.session_state.room_code, st.session_state.player_token)
+    st.session_state.room_code = None
+    st.session_state.scores = {'X': 0, 'O': 0, 'Draws': 0}
+    st.query_params.pop("room", None)
+
+def join_room(code, seat_key=None):
+    """Join a room by code, returns False if there is no such room
+
+    A seat key (shown to each seated player) takes that player's seat back,
+    e.g. after a page reload.
+    """
+    if seat_key:
+        st.session_state.player_token = seat_key.strip()
+    try:
+        rooms.join(code, st.session_state.player_token)
+    except ValueError as e:
+        st.session_state.room_message = str(e)
+        st.query_params.pop("room", None)
+        return False
+    st.session_state.room_code = normalize_code(code)
+    st.query_params["room"] = st.session_state.room_code
+    return True
+
+# Online rooms: the room, not this session, holds the board
+room = None
+if st.session_state.game_mode == 'Online Room':
+    if st.session_state.room_code is None and st.query_params.get("room"):
+        # Opened from a shared room link
+        join_room(st.query_params["room"])
+    if st.session_state.room_code is not None:
+        room = rooms.get(st.session_state.room_code)
+        if room is None:
+            st.session_state.room_message = f"Room {st.session_state.room_code} has closed"
+            leave_room()
+        else:
+            sync_room(room)
 
-def is_board_full(board):
-    """Check if the board is full"""
-    return all(board[i][j] != '' for i in range(3) for j in range(3))
+board = Board(st.session_state.board_size, st.session_state.win_length)
+my_side = None
+if room is not None:
+    my_side = next((side for side, token in room['players'].items() if token == st.session_state.player_token), None)
 
-def get_computer_move(board):
-    """Get a random valid move for the computer"""
-    empty_cells = [(i, j) for i in range(3) for j in range(3) if board[i][j] == '']
-    return random.choice(empty_cells) if empty_cells else None
+def get_computer_move(x, o):
+    """Get the computer's move (cell index) for the chosen difficulty"""
+    return board.computer_move(x, o, 'O', st.session_state.difficulty, time_budget=1.0)
+
+def apply_move(player, index):
+    """Place a mark and update game over / winner / scores, returns True if the game ended"""
+    x, o, result = board.play(st.session_state.x_bits, st.session_state.o_bits, player, index)
+    st.session_state.x_bits, st.session_state.o_bits = x, o
+    if result is None:
+        return False
+
+    st.session_state.game_over = True
+    st.session_state.winner = result
+    if result == 'Draw':
+        st.session_state.scores['Draws'] += 1
+    else:
+        if board.classic:
+            st.session_state.winning_line = winner(x, o)[1]
+        else:
+            # Only the lines through the last move can have just been completed
+            st.session_state.winning_line = board.winning_line(x if result == 'X' else o, index)
+        st.session_state.scores[result] += 1
+    return True
 
 def make_move(row, col):
     """Make a move on the board"""
-    if st.session_state.board[row][col] == '' and not st.session_state.game_over:
-        st.session_state.board[row][col] = st.session_state.current_player
-        
-        # Check for winner
-        winner, winning_line = check_winner(st.session_state.board)
-        if winner:
-            st.session_state.game_over = True
-            st.session_state.winner = winner
-            st.session_state.winning_line = winning_line
-            st.session_state.scores[winner] += 1
-        elif is_board_full(st.session_state.board):
-            st.session_state.game_over = True
-            st.session_state.winner = 'Draw'
-            st.session_state.scores['Draws'] += 1
-        else:
-            # Switch player
-            st.session_state.current_player = 'O' if st.session_state.current_player == 'X' else 'X'
-            
-            # Computer move if in computer mode and it's O's turn
-            if (st.session_state.game_mode == 'vs Computer' and 
-                st.session_state.current_player == 'O' and 
-                not st.session_state.game_over):
-                
-                time.sleep(0.5)  # Small delay for better UX
-                comp_row, comp_col = get_computer_move(st.session_state.board)
-                if comp_row is not None:
-                    st.session_state.board[comp_row][comp_col] = 'O'
-                    
-                    # Check for winner after computer move
-                    winner, winning_line = check_winner(st.session_state.board)
-                    if winner:
-                        st.session_state.game_over = True
-                        st.session_state.winner = winner
-                        st.session_state.winning_line = winning_line
-                        st.session_state.scores[winner] += 1
-                    elif is_board_full(st.session_state.board):
-                        st.session_state.game_over = True
-                        st.session_state.winner = 'Draw'
-                        st.session_state.scores['Draws'] += 1
-                    else:
-                        st.session_state.current_player = 'X'
-
-def reset_game():
-    """Reset the game board"""
-    st.session_state.board = [['' for _ in range(3)] for _ in range(3)]
+    if room is not None:
+        try:
+            sync_room(rooms.move(room['code'], st.session_state.player_token, board.index(row, col)))
+        except ValueError as e:
+            st.session_state.room_message = str(e)
+        return
+    if board.cell_value(st.session_state.x_bits, st.session_state.o_bits, row, col) == '' and not st.session_state.game_over:
+        st.session_state.last_computer_move = None
+        if apply_move(st.session_state.current_player, board.index(row, col)):
+            return
+
+        # Switch player
+        st.session_state.current_player = 'O' if st.session_state.current_player == 'X' else 'X'
+
+        # Computer move if in computer mode and it's O's turn
+        if st.session_state.game_mode == 'vs Computer' and st.session_state.current_player == 'O':
+            # Answer right away; the pause before the O shows up is a CSS animation
+            comp_move = get_computer_move(st.session_state.x_bits, st.session_state.o_bits)
+            if comp_move is not None:
+                st.session_state.last_computer_move = divmod(comp_move, board.size)
+                if not apply_move('O', comp_move):
+                    st.session_state.current_player = 'X'
+
+def reset_game(clear_scores=False, new_round=False):
+    """Reset the game board (in an online room, for both players)
+
+    In a room, New Round only clears a finished game, so it just catches up
+    if the other player has already started the next one.
+    """
+    if room is not None:
+        try:
+            sync_room(rooms.new_round(room['code'], st.session_state.player_token, clear_scores, only_if_over=new_round))
+        except ValueError as e:
+            st.session_state.room_message = str(e)
+        return
+    if clear_scores:
+        st.session_state.scores = {'X': 0, 'O': 0, 'Draws': 0}
+    st.session_state.x_bits = 0
+    st.session_state.o_bits = 0
     st.session_state.current_player = 'X'
     st.session_state.game_over = False
     st.session_state.winner = None
     st.session_state.winning_line = []
+    st.session_state.last_computer_move = None
 
 # Title
 st.markdown('<h1 class="main-title">🎮 TIC-TAC-TOE 🎮</h1>', unsafe_allow_html=True)
@@ -244,12 +321,73 @@ col1, col2, col3 = st.columns([1, 2, 1])
 with col2:
     game_mode = st.selectbox(
         "🎯 Select Game Mode:",
-        ["Two Player", "vs Computer"],
-        index=0 if st.session_state.game_mode == "Two Player" else 1
+        GAME_MODES,
+        index=GAME_MODES.index(st.session_state.game_mode)
     )
     if game_mode != st.session_state.game_mode:
+        if room is not None:
+            leave_room()
         st.session_state.game_mode = game_mode
+        room = None
         reset_game()
+        st.rerun()
+    if st.session_state.game_mode == "vs Computer":
+        difficulty = st.select_slider(
+            "🧠 Difficulty:",
+            options=DIFFICULTIES,
+            value=st.session_state.difficulty,
+        )
+        if difficulty != st.session_state.difficulty:
+            st.session_state.difficulty = difficulty
+            reset_game()
+    if st.session_state.game_mode == "Online Room":
+        if st.session_state.room_message:
+            st.warning(st.session_state.room_message)
+            st.session_state.room_message = None
+        if room is None:
+            with st.form("join_room_form"):
+                code = st.text_input("🔑 Room Code:", max_chars=10)
+                seat_key = st.text_input("🎟️ Seat Key (optional):", help="Your seat key from earlier, to get your seat back")
+                if st.form_submit_button("🚪 Join Room") and code.strip():
+                    if join_room(code, seat_key):
+                        st.rerun()
+                    st.warning(st.session_state.room_message)
+                    st.session_state.room_message = None
+            if st.button("✨ Create Room", help="Open a room with the board settings below, you play X"):
+                code = rooms.create_room(st.session_state.player_token, st.session_state.board_size, st.session_state.win_length)
+                join_room(code)
+                st.rerun()
+        else:
+            seat = f"you play {my_side}" if my_side else "both seats are taken, you are watching"
+            waiting = " Waiting for an opponent to join..." if None in room['players'].values() else ""
+            st.info(f"Room **{room['code']}** ({room['size']} x {room['size']}, {room['k']} in a row), {seat}.{waiting}")
+            if my_side:
+                st.caption("Your seat key (keep it to yourself; enter it with the room code to get your seat back after a reload):")
+                st.code(st.session_state.player_token, language=None)
+            if st.button("🚪 Leave Room"):
+                leave_room()
+                st.rerun()
+    if room is None:
+        size_col, length_col = st.columns(2)
+        with size_col:
+            board_size = st.selectbox(
+                "📐 Board Size:",
+                BOARD_SIZES,
+                index=BOARD_SIZES.index(st.session_state.board_size),
+                format_func=lambda n: f"{n} x {n}",
+            )
+        with length_col:
+            lengths = list(range(3, board_size + 1))
+            win_length = st.selectbox(
+                "🔗 In a Row to Win:",
+                lengths,
+                index=lengths.index(min(st.session_state.win_length, board_size)),
+            )
+        if (board_size, win_length) != (st.session_state.board_size, st.session_state.win_length):
+            st.session_state.board_size = board_size
+            st.session_state.win_length = win_length
+            reset_game()
+            st.rerun()
 
 # Score display
 st.markdown(f"""
@@ -259,9 +397,14 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 # Current player display
+# In a room only the player holding the current side may click the board
+my_turn = room is None or my_side == st.session_state.current_player
 if not st.session_state.game_over:
     player_emoji = "❌" if st.session_state.current_player == 'X' else "⭕"
-    st.markdown(f"<h3 style='text-align: center; color: #00ff88;'>Current Player: {player_emoji} {st.session_state.current_player}</h3>", 
+    turn_note = ""
+    if room is not None and my_side:
+        turn_note = " (your turn)" if my_turn else " (waiting for your opponent)"
+    st.markdown(f"<h3 style='text-align: center; color: #00ff88;'>Current Player: {player_emoji} {st.session_state.current_player}{turn_note}</h3>", 
                 unsafe_allow_html=True)
 
 # Winner announcement with animation
@@ -275,22 +418,47 @@ if st.session_state.game_over and st.session_state.winner:
 
 # Game board
 st.markdown("### 🎲 Game Board")
+if st.session_state.get('last_computer_move'):
+    r, c = st.session_state.last_computer_move
+    st.markdown(f"""
+    <style>
+        .st-key-btn_{r}_{c} button {{
+            animation: computer-move 0.3s ease 0.5s both !important;
+        }}
+    </style>
+    """, unsafe_allow_html=True)
+if board.size > 3:
+    # Shrink the cells so bigger boards still fit on the page
+    cell_px = max(28, min(120, 480 // board.size))
+    st.markdown(f"""
+    <style>
+        [class*="st-key-btn_"] button {{
+            height: {cell_px}px !important;
+            width: {cell_px}px !important;
+            min-height: {cell_px}px !important;
+            min-width: {cell_px}px !important;
+            max-height: {cell_px}px !important;
+            max-width: {cell_px}px !important;
+            font-size: {cell_px * 0.4:.0f}px !important;
+        }}
+    </style>
+    """, unsafe_allow_html=True)
 st.markdown('<div class="game-board">', unsafe_allow_html=True)
 
-for i in range(3):
+for i in range(board.size):
     st.markdown('<div class="board-row">', unsafe_allow_html=True)
-    cols = st.columns([1, 1, 1], gap="small")
+    cols = st.columns(board.size, gap="small")
     
-    for j in range(3):
+    for j in range(board.size):
         with cols[j]:
             # Determine button style and content
-            cell_value = st.session_state.board[i][j]
+            cell = board.cell_value(st.session_state.x_bits, st.session_state.o_bits, i, j)
             button_text = "　"  # Wide space for empty cells
             
             # Add emoji for X and O
-            if cell_value == 'X':
+            if cell == 'X':
                 button_text = "❌"
-            elif cell_value == 'O':
+            elif cell == 'O':
                 button_text = "⭕"
             
             # Check if this cell is part of winning line
@@ -302,7 +470,7 @@ for i in range(3):
                 button_text,
                 key=button_key,
                 help=f"Row {i+1}, Column {j+1}",
-                disabled=cell_value != '' or st.session_state.game_over
+                disabled=cell != '' or st.session_state.game_over or not my_turn
             ):
                 make_move(i, j)
                 st.rerun()
@@ -311,6 +479,20 @@ for i in range(3):
 
 st.markdown('</div>', unsafe_allow_html=True)
 
+@st.fragment(run_every=WATCH_SECONDS)
+def watch_room(code, version):
+    """Redraw the page once the room's version moves on (a quick, non-blocking check)"""
+    latest = rooms.get(code)
+    if latest is None or latest['version'] != version:
+        st.rerun()
+
+# Only check the room while waiting on the other side: their move, or an
+# empty seat. On our own turn or after a game nothing can change the board
+# until someone here clicks, so no timer runs.
+if room is not None and not st.session_state.game_over:
+    if not my_turn or None in room['players'].values():
+        watch_room(room['code'], room['version'])
+
 # Control buttons
 col1, col2, col3 = st.columns([1, 1, 1])
 
@@ -321,22 +503,32 @@ with col1:
 
 with col2:
     if st.button("🗑️ Clear Scores", help="Reset all scores to zero"):
-        st.session_state.scores = {'X': 0, 'O': 0, 'Draws': 0}
+        reset_game(clear_scores=True)
         st.rerun()
 
 with col3:
     if st.button("🎲 New Round", help="Start new round (keep scores)"):
-        reset_game()
+        reset_game(new_round=True)
         st.rerun()
 
 # Game instructions
 with st.expander("📖 How to Play", expanded=False):
     st.markdown("""
     **🎯 Objective:** Get three of your marks (X or O) in a row, column, or diagonal.
+    On bigger boards, pick how many in a row it takes to win (5 on 15 x 15 is gomoku).
     
     **🎮 Two Player Mode:** Players take turns clicking empty squares.
     
-    **🤖 vs Computer Mode:** You play as X, computer plays as O with random moves.
+    **🌐 Online Room Mode:** Create a room and send its code (or the page link) to a friend on
+    another device. Players take the free seats (X first) and anyone else watches. Lost your
+    seat after a reload? Join again with the room code and your seat key. After a game, press
+    New Round to play again or to pick up a round your opponent already started.
+
+    **🤖 vs Computer Mode:** You play as X, computer plays as O.
+    - *Easy* plays random moves
+    - *Medium* takes wins and blocks yours, otherwise plays randomly
+    - *Hard* plays perfectly (you can draw, but never win!)
+    - On bigger boards *Hard* searches ahead for about a second per move
     
     **✨ Features:**
     - 🎨 Dark theme with glowing effects
@@ -0,0 +1,145 @@
+"""Computer opponents for rock-paper-scissors.
+
+Every opponent has the same two methods: choose() picks the computer's throw
+for the next round, observe(player_choice) is told what the player threw once
+the round is over.
+
+AdaptiveOpponent learns the player's habits with n-gram tables: for the last
+1, 2, ... max_order throws it counts what the player threw next. Each round
+only touches one row per order, so updates cost the same after 10 rounds or
+100,000, and the tables never grow past (throws ** order) rows.
+"""
+import random
+from collections import deque
+
+MAX_ORDER = 3
+DECAY = 0.9  # older observations fade so the tables follow a player who changes habits
+SCORE_DECAY = 0.95
+
+
+class RandomOpponent:
+    """Throws uniformly at random (unbeatable on average, but never learns)"""
+
+    def __init__(self, choices, rng=random):
+        self.choices = list(choices)
+        self.rng = rng
+
+    def choose(self):
+        return self.rng.choice(self.choices)
+
+    def observe(self, player_choice):
+        pass
+
+
+class PatternPredictor:
+    """Predicts the player's next throw from the throws just before it
+
+    One frequency table per context length (0 = overall frequencies,
+    1 = after the last throw, ...). Each order's predictions are scored as
+    the rounds go by and the best-scoring order makes the call, so short and
+    long patterns are both picked up.
+    """
+
+    def __init__(self, choices, max_order=MAX_ORDER, decay=DECAY):
+        self.choices = list(choices)
+        self._index = {choice: i for i, choice in enumerate(self.choices)}
+        self.max_order = max_order
+        self.decay = decay
+        self._tables = [{} for _ in range(max_order + 1)]  # order -> {context: [weight per choice]}
+        self._scores = [0.0] * (max_order + 1)  # decayed hit count of each order
+        self._recent = deque(maxlen=max_order)
+        self.rounds = 0
+
+    def _contexts(self):
+        """(order, context) for every order the recent throws are long enough for"""
+        recent = tuple(self._recent)
+        return [(k, recent[len(recent) - k:]) for k in range(min(len(recent), self.max_order) + 1)]
+
+    def _guesses(self):
+        """{order: predicted choice index} for the orders that have seen this context"""
+        guesses = {}
+        for k, context in self._contexts():
+            row = self._tables[k].get(context)
+            if row is not None:
+                guesses[k] = max(range(len(row)), key=row.__getitem__)
+        return guesses
+
+    def predict(self):
+        """Most likely next throw, or None before the first round"""
+        guesses = self._guesses()
+        if not guesses:
+            return None
+        # Best score wins; on a tie the longer context is more specific
+        order = max(guesses, key=lambda k: (self._scores[k], k))
+        return self.choices[guesses[order]]
+
+    def update(self, choice):
+        """Record the player's throw: O(max_order * throws) whatever the history length"""
+        i = self._index[choice]
+        for k, guess in self._guesses().items():
+            self._scores[k] = self._scores[k] * SCORE_DECAY + (guess == i)
+        for k, context in self._contexts():
+            row = self._tables[k].get(context)
+            if row is None:
+                row = self._tables[k][context] = [0.0] * len(self.choices)
+            for j in range(len(row)):
+                row[j] *= self.decay
+            row[i] += 1
+        self._recent.append(i)
+        self.rounds += 1
+
+
+class AdaptiveOpponent:
+    """Plays whatever beats the player's predicted throw
+
+    `counters` maps each throw to the throw that beats it. A little random
+    play (`noise`) keeps it from being trivially led into a trap.
+    """
+
+    def __init__(self, choices, counters, max_order=MAX_ORDER, noise=0.1, rng=random):
+        self.choices = list(choices)
+        self.counters = counters
+        self.noise = noise
+        self.rng = rng
+        self.predictor = PatternPredictor(self.choices, max_order)
+
+    def choose(self):
+        guess = self.predictor.predict()
+        if guess is None or self.rng.random() < self.noise:
+            return self.rng.choice(self.choices)
+        return self.counters[guess]
+
+    def observe(self, player_choice):
+        self.predictor.update(player_choice)
+
+
+class FavouriteOpponent:
+    """Throws its favourite `bias` of the time, otherwise at random"""
+
+    def __init__(self, choices, favourite, bias=0.6, rng=random):
+        self.choices = list(choices)
+        self.favourite = favourite
+        self.bias = bias
+        self.rng = rng
+
+    def choose(self):
+        return self.favourite if self.rng.random() < self.bias else self.rng.choice(self.choices)
+
+    def observe(self, player_choice):
+        pass
+
+
+class CycleOpponent:
+    """Goes round the throws in order"""
+
+    def __init__(self, choices):
+        self.choices = list(choices)
+        self._next = 0
+
+    def choose(self):
+        choice = self.choices[self._next]
+        self._next = (self._next + 1) % len(self.choices)
+        return choice
+
+    def observe(self, player_choice):
+        pass
@@ -0,0 +1,74 @@
+"""Compact rock-paper-scissors game history.
+
+The full record is kept column by column in byte arrays (one byte each for
+the player's throw, the computer's throw and the result), so 100,000 rounds
+take about 300 KB instead of 100,000 dicts. The last few rounds also sit in a
+small ring buffer for display, and running counters answer the usual stats
+questions without scanning anything.
+"""
+from array import array
+from collections import deque
+import numpy as np
+
+RESULTS = ["win", "lose", "tie"]
+RECENT_ROUNDS = 10
+
+
+class GameHistory:
+    """Every round of one session: recent rounds, byte columns and running counters"""
+
+    def __init__(self, choices, recent_rounds=RECENT_ROUNDS):
+        self.choices = list(choices)
+        if len(self.choices) > 255:
+            raise ValueError("At most 255 choices fit in a byte column")
+        self._index = {choice: i for i, choice in enumerate(self.choices)}
+        self._result_index = {result: i for i, result in enumerate(RESULTS)}
+        self.player = array('B')
+        self.computer = array('B')
+        self.result = array('B')
+        self._recent = deque(maxlen=recent_rounds)
+        n = len(self.choices)
+        self._result_counts = [0] * len(RESULTS)
+        # _outcomes[choice * 3 + result]: how each of the player's throws turned out
+        self._outcomes = array('L', [0] * (n * len(RESULTS)))
+
+    def __len__(self):
+        return len(self.result)
+
+    def record(self, player, computer, result):
+        """Add one round, O(1)"""
+        p, c, r = self._index[player], self._index[computer], self._result_index[result]
+        self.player.append(p)
+        self.computer.append(c)
+        self.result.append(r)
+        self._result_counts[r] += 1
+        self._outcomes[p * len(RESULTS) + r] += 1
+        self._recent.append({'round': len(self.result), 'player': player, 'computer': computer, 'result': result})
+
+    def recent(self, count=5):
+        """The last `count` rounds (up to the ring buffer size), oldest first, as dicts"""
+        if count <= 0:
+            return []
+        return list(self._recent)[-count:]
+
+    def result_counts(self):
+        """{'win': n, 'lose': n, 'tie': n} over every round"""
+        return dict(zip(RESULTS, self._result_counts))
+
+    def choice_outcomes(self):
+        """{choice: {'win': n, 'lose': n, 'tie': n}} for each of the player's throws"""
+        return {
+            choice: dict(zip(RESULTS, self._outcomes[i * len(RESULTS):(i + 1) * len(RESULTS)]))
+            for i, choice in enumerate(self.choices)
+        }
+
+    def columns(self):
+        """The full record as NumPy uint8 arrays (player, computer, result)
+
+        Copies, since an array can't grow while NumPy is viewing its buffer.
+        """
+        return tuple(np.frombuffer(column, dtype=np.uint8).copy() for column in (self.player, self.computer, self.result))
+
+    def nbytes(self):
+        """Bytes held by the columns and counters"""
+        return sum(a.itemsize * len(a) for a in (self.player, self.computer, self.result, self._outcomes))
@@ -0,0 +1,221 @@
+"""Best-of-N matches, round-robin tournaments and a saved leaderboard.
+
+Standings are running totals updated as each match is saved, so the
+leaderboard is one read of a covering index (points, then wins) however many
+matches have been recorded; each match is also kept for the recent-matches
+list.
+
+Players are keyed by an ID, not by the name shown. A personality's ID is
+its name; a person's is "human:" plus an ID made for their session (see
+human_player) and never taken from the page link, so two people both called
+"You" stay apart and nobody can play under an AI's or another person's
+standings.
+"""
+import os
+import random
+import sqlite3
+import threading
+from datetime import datetime
+from itertools import combinations
+from day13_ai import AdaptiveOpponent, CycleOpponent, FavouriteOpponent, RandomOpponent
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rps_leaderboard.db")
+BEST_OF = [3, 5, 7]
+POINTS = {'win': 3, 'draw': 1, 'loss': 0}
+MAX_MATCH_ROUNDS = 1000  # two computers that keep tying call it a draw
+
+# ----------------- AI PERSONALITIES -----------------
+# name -> function(choices, counters) returning a fresh opponent (see day13_ai)
+PERSONALITIES = {
+    "🎲 Random Randy": lambda choices, counters: RandomOpponent(choices),
+    "🪨 Rocky": lambda choices, counters: FavouriteOpponent(choices, choices[0]),
+    "🔁 Cyclone": lambda choices, counters: CycleOpponent(choices),
+    "🧠 Adaptive Ada": lambda choices, counters: AdaptiveOpponent(choices, counters),
+}
+
+
+def human_player(player_id, name):
+    """(standings ID, display name) for a person; the ID suffix tells same-named players apart"""
+    return f"human:{player_id}", f"👤 {name} #{player_id[:4]}"
+
+
+class Match:
+    """A best-of-N match between two named players; ties are replayed
+
+    a_id / b_id are the players' standings IDs and default to their names.
+    """
+
+    def __init__(self, player_a, player_b, best_of=3, a_id=None, b_id=None):
+        if best_of < 1 or best_of % 2 == 0:
+            raise ValueError("Best-of needs an odd number of games")
+        self.player_a = player_a
+        self.player_b = player_b
+        self.a_id = a_id or player_a
+        self.b_id = b_id or player_b
+        self.best_of = best_of
+        self.a_wins = self.b_wins = self.ties = 0
+
+    @property
+    def wins_needed(self):
+        return self.best_of // 2 + 1
+
+    @property
+    def over(self):
+        return max(self.a_wins, self.b_wins) >= self.wins_needed
+
+    @property
+    def winner(self):
+        """Name of the winner once the match is over, else None"""
+        if self.a_wins >= self.wins_needed:
+            return self.player_a
+        if self.b_wins >= self.wins_needed:
+            return self.player_b
+        return None
+
+    def record(self, result):
+        """Add a round's result from player_a's side ('win', 'lose' or 'tie')"""
+        if self.over:
+            raise ValueError("This match is already over")
+        if result == 'win':
+            self.a_wins += 1
+        elif result == 'lose':
+            self.b_wins += 1
+        else:
+            self.ties += 1
+
+
+def play_ai_match(name_a, name_b, best_of, choices, counters, determine_winner, max_rounds=MAX_MATCH_ROUNDS):
+    """Play two personalities against each other; returns the finished Match (no winner if it ran out of rounds)"""
+    match = Match(name_a, name_b, best_of)
+    a = PERSONALITIES[name_a](choices, counters)
+    b = PERSONALITIES[name_b](choices, counters)
+    for _ in range(max_rounds):
+        throw_a, throw_b = a.choose(), b.choose()
+        match.record(determine_winner(throw_a, throw_b))
+        a.observe(throw_b)
+        b.observe(throw_a)
+        if match.over:
+            break
+    return match
+
+
+def round_robin(entrants):
+    """Every pairing of the entrants once, in a fixed order"""
+    return list(combinations(entrants, 2))
+
+
+def new_tournament_id():
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{random.getrandbits(16):04x}"
+
+
+def tournament_table(matches):
+    """Standings for a list of finished Matches: rows sorted by points, then wins"""
+    table = {}
+    for match in matches:
+        for name in (match.player_a, match.player_b):
+            table.setdefault(name, {"Player": name, "Played": 0, "Won": 0, "Drawn": 0, "Lost": 0, "Points": 0})
+        for name in (match.player_a, match.player_b):
+            row = table[name]
+            row["Played"] += 1
+            outcome = 'draw' if match.winner is None else 'win' if match.winner == name else 'loss'
+            row[{'win': "Won", 'draw': "Drawn", 'loss': "Lost"}[outcome]] += 1
+            row["Points"] += POINTS[outcome]
+    return sorted(table.values(), key=lambda row: (-row["Points"], -row["Won"], row["Player"]))
+
+
+class LeaderboardStore:
+    """Every finished match plus running standings per player, in SQLite"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS matches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                a_id TEXT NOT NULL,
+                b_id TEXT NOT NULL,
+                player_a TEXT NOT NULL,
+                player_b TEXT NOT NULL,
+                best_of INTEGER NOT NULL,
+                a_wins INTEGER NOT NULL,
+                b_wins INTEGER NOT NULL,
+                ties INTEGER NOT NULL,
+                winner TEXT,
+                tournament TEXT,
+                played_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS standings (
+                player_id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                played INTEGER NOT NULL DEFAULT 0,
+                won INTEGER NOT NULL DEFAULT 0,
+                drawn INTEGER NOT NULL DEFAULT 0,
+                lost INTEGER NOT NULL DEFAULT 0,
+                rounds_won INTEGER NOT NULL DEFAULT 0,
+                rounds_lost INTEGER NOT NULL DEFAULT 0,
+                points INTEGER NOT NULL DEFAULT 0
+            );
+            -- Holds every column leaderboard() reads, so the top N come straight off the index
+            CREATE INDEX IF NOT EXISTS idx_standings_rank
+                ON standings(points DESC, won DESC, name, played, drawn, lost, rounds_won, rounds_lost);
+            CREATE INDEX IF NOT EXISTS idx_matches_a_id ON matches(a_id, id);
+            CREATE INDEX IF NOT EXISTS idx_matches_b_id ON matches(b_id, id);
+            CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches(tournament);
+        """)
+        self.conn.commit()
+
+    def record_match(self, match, tournament=None):
+        """Save a finished match (no winner counts as a draw) and add it to both players' standings"""
+        now = datetime.now().isoformat(timespec="seconds")
+        a_won, b_won = (match.a_wins >= match.wins_needed), (match.b_wins >= match.wins_needed)
+        sides = [
+            (match.a_id, match.player_a, match.a_wins, match.b_wins, 'win' if a_won else 'loss' if b_won else 'draw'),
+            (match.b_id, match.player_b, match.b_wins, match.a_wins, 'win' if b_won else 'loss' if a_won else 'draw'),
+        ]
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO matches (a_id, b_id, player_a, player_b, best_of, a_wins, b_wins, ties, winner, "
+                "tournament, played_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (match.a_id, match.b_id, match.player_a, match.player_b, match.best_of, match.a_wins,
+                 match.b_wins, match.ties, match.winner, tournament, now),
+            )
+            for player_id, name, rounds_won, rounds_lost, outcome in sides:
+                # The latest name wins, so a player who renames keeps their record
+                self.conn.execute(
+                    "INSERT INTO standings (player_id, name, played, won, drawn, lost, rounds_won, rounds_lost, points) "
+                    "VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(player_id) DO UPDATE SET name = excluded.name, played = played + 1, "
+                    "won = won + excluded.won, drawn = drawn + excluded.drawn, lost = lost + excluded.lost, "
+                    "rounds_won = rounds_won + excluded.rounds_won, rounds_lost = rounds_lost + excluded.rounds_lost, "
+                    "points = points + excluded.points",
+                    (player_id, name, outcome == 'win', outcome == 'draw', outcome == 'loss', rounds_won, rounds_lost,
+                     POINTS[outcome]),
+                )
+        return cursor.lastrowid
+
+    def leaderboard(self, limit=10):
+        """Top players as dicts, best first (read from the covering rank index alone)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT name, played, won, drawn, lost, rounds_won, rounds_lost, points FROM standings "
+                "ORDER BY points DESC, won DESC, name LIMIT ?",
+                (limit,),
+            ).fetchall()
+        columns = ["Player", "Played", "Won", "Drawn", "Lost", "Rounds Won", "Rounds Lost", "Points"]
+        return [dict(zip(columns, row)) for row in rows]
+
+    def recent_matches(self, player_id=None, limit=10):
+        """Latest matches, optionally only those the player with this ID played in, newest first"""
+        query = "SELECT id, player_a, player_b, best_of, a_wins, b_wins, ties, winner, tournament, played_at FROM matches"
+        params = []
+        if player_id is not None:
+            query += " WHERE a_id = ? OR b_id = ?"
+            params = [player_id, player_id]
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY id DESC LIMIT ?", params + [limit]).fetchall()
+        columns = ["id", "player_a", "player_b", "best_of", "a_wins", "b_wins", "ties", "winner", "tournament", "played_at"]
+        return [dict(zip(columns, row)) for row in rows]
@@ -1,6 +1,12 @@
 import streamlit as st
-import random
-import time
+import os
+import uuid
+from day13_ai import AdaptiveOpponent, RandomOpponent
+from day13_history import RESULTS, GameHistory
+from day13_league import (BEST_OF, PERSONALITIES, LeaderboardStore, Match, human_player, new_tournament_id,
+                          play_ai_match, round_robin, tournament_table)
+from day13_rules import DEFAULT_RULES_PATH, load_rule_sets
+from day13_stats import RoundStats
 
 # Configure page
 st.set_page_config(
@@ -151,6 +157,31 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Game choices
+@st.cache_resource
+def load_rules(path, modified):
+    """Rule sets from the config file (reloaded when the file changes)"""
+    return load_rule_sets(path)
+
+RULE_SETS = load_rules(DEFAULT_RULES_PATH, os.path.getmtime(DEFAULT_RULES_PATH))
+if st.session_state.get('rule_set') not in RULE_SETS:
+    st.session_state.rule_set = next(iter(RULE_SETS))
+rules = RULE_SETS[st.session_state.rule_set]
+
+CHOICES = rules.emojis  # throw -> emoji
+CHOICE_NAMES = rules.names
+# A throw that beats each throw
+COUNTERS = rules.counters
+OPPONENTS = ["Random", "Adaptive"]
+ROLLING_WINDOWS = [10, 20, 50, 100]
+
+def new_opponents():
+    """Fresh computer players; both watch every round so switching keeps what was learned"""
+    return {
+        "Random": RandomOpponent(CHOICE_NAMES),
+        "Adaptive": AdaptiveOpponent(CHOICE_NAMES, COUNTERS),
+    }
+
 # Initialize session state
 if 'player_score' not in st.session_state:
     st.session_state.player_score = 0
@@ -160,29 +191,34 @@ if 'player_score' not in st.session_state:
     st.session_state.last_result = None
     st.session_state.player_choice = None
     st.session_state.computer_choice = None
-    st.session_state.game_history = []
+    st.session_state.game_history = GameHistory(CHOICE_NAMES)
+    st.session_state.stats = RoundStats()
+    st.session_state.opponent = 'Random'
+    st.session_state.opponents = new_opponents()
+    st.session_state.player_name = 'You'
+    # Leaderboard identity for this session only; a shared page link must not carry it
+    st.session_state.player_id = uuid.uuid4().hex
+    st.session_state.match = None
+    st.session_state.match_opponent = None
+    st.session_state.tournament = None
+    st.session_state.match_message = None
 
-# Game choices
-CHOICES = {
-    'Rock': '🪨',
-    'Paper': '📄', 
-    'Scissors': '✂️'
-}
+@st.cache_resource
+def get_leaderboard():
+    """One leaderboard database shared by every session"""
+    return LeaderboardStore()
+
+leaderboard = get_leaderboard()
 
 def get_computer_choice():
-    """Get random choice for computer"""
-    return random.choice(list(CHOICES.keys()))
+    """Get the computer's choice from the match or selected opponent (decided before it sees yours)"""
+    if st.session_state.match is not None:
+        return st.session_state.match_opponent.choose()
+    return st.session_state.opponents[st.session_state.opponent].choose()
 
 def determine_winner(player, computer):
-    """Determine the winner of the round"""
-    if player == computer:
-        return "tie"
-    elif (player == "Rock" and computer == "Scissors") or \
-         (player == "Paper" and computer == "Rock") or \
-         (player == "Scissors" and computer == "Paper"):
-        return "win"
-    else:
-        return "lose"
+    """Determine the winner of the round (one lookup in the rule set's outcome table)"""
+    return rules.result(player, computer)
 
 def play_round(player_choice):
     """Play a single round"""
@@ -194,6 +230,8 @@ def play_round(player_choice):
     st.session_state.computer_choice = computer_choice
     st.session_state.last_result = result
     st.session_state.total_games += 1
+    for opponent in st.session_state.opponents.values():
+        opponent.observe(player_choice)
     
     # Update scores
     if result == "win":
@@ -203,17 +241,54 @@ def play_round(player_choice):
     else:
         st.session_state.ties += 1
     
-    # Add to history
-    st.session_state.game_history.append({
-        'round': st.session_state.total_games,
-        'player': player_choice,
-        'computer': computer_choice,
-        'result': result
-    })
-    
-    # Keep only last 10 games in history
-    if len(st.session_state.game_history) > 10:
-        st.session_state.game_history.pop(0)
+    # Add to history (a few bytes per round, the last 10 kept for display)
+    st.session_state.game_history.record(player_choice, computer_choice, result)
+    st.session_state.stats.record(result)
+
+    # Best-of match in progress
+    if st.session_state.match is not None:
+        st.session_state.match_opponent.observe(player_choice)
+        st.session_state.match.record(result)
+        if st.session_state.match.over:
+            finish_match()
+
+def start_match(opponent, best_of):
+    """Start a best-of match against an AI personality"""
+    player_id, name = human_player(st.session_state.player_id, st.session_state.player_name)
+    st.session_state.match = Match(name, opponent, best_of, a_id=player_id)
+    st.session_state.match_opponent = PERSONALITIES[opponent](CHOICE_NAMES, COUNTERS)
+
+def finish_match():
+    """Save the finished match and move the tournament (if any) on to the next opponent"""
+    match = st.session_state.match
+    tournament = st.session_state.tournament
+    leaderboard.record_match(match, tournament['id'] if tournament else None)
+    won = match.winner == match.player_a
+    st.session_state.match_message = (
+        f"{'🏆 You won' if won else '💻 You lost'} the match against {match.player_b}, {match.a_wins}-{match.b_wins}!"
+    )
+    st.session_state.match = st.session_state.match_opponent = None
+    if tournament is not None:
+        tournament['matches'].append(match)
+        if tournament['queue']:
+            start_match(tournament['queue'].pop(0), tournament['best_of'])
+        else:
+            tournament['finished'] = True
+            st.session_state.match_message += " The tournament is over."
+
+def start_tournament(entrants, best_of):
+    """Round robin between you and the chosen personalities
+
+    The computer-vs-computer matches are played (and saved) right away;
+    yours are queued up one after another.
+    """
+    tournament = {'id': new_tournament_id(), 'best_of': best_of, 'matches': [], 'queue': list(entrants), 'finished': False}
+    for a, b in round_robin(entrants):
+        match = play_ai_match(a, b, best_of, CHOICE_NAMES, COUNTERS, determine_winner)
+        leaderboard.record_match(match, tournament['id'])
+        tournament['matches'].append(match)
+    st.session_state.tournament = tournament
+    start_match(tournament['queue'].pop(0), best_of)
 
 def reset_game():
     """Reset all game statistics"""
@@ -224,13 +299,23 @@ def reset_game():
     st.session_state.last_result = None
     st.session_state.player_choice = None
     st.session_state.computer_choice = None
-    st.session_state.game_history = []
+    st.session_state.game_history = GameHistory(CHOICE_NAMES)
+    st.session_state.stats = RoundStats(st.session_state.stats.window)
+    st.session_state.opponents = new_opponents()
+
+# New rule set (or a changed rules file): start over with its throws
+if st.session_state.game_history.choices != CHOICE_NAMES:
+    reset_game()
+    st.session_state.match = st.session_state.match_opponent = st.session_state.tournament = None
 
 def get_win_percentage():
-    """Calculate win percentage"""
-    if st.session_state.total_games == 0:
-        return 0
-    return (st.session_state.player_score / st.session_state.total_games) * 100
+    """Win percentage (kept up to date by the stats engine as rounds are played)"""
+    return st.session_state.stats.win_rate()
+
+def streak_text(result, length):
+    if not length:
+        return "-"
+    return f"{length} {'win' if result == 'win' else 'loss'}{'' if length == 1 else 'es' if result == 'lose' else 's'}"
 
 # Main app layout
 st.markdown('<h1 class="main-title">🎮 Rock Paper Scissors 🎮</h1>', unsafe_allow_html=True)
@@ -247,25 +332,74 @@ st.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
-# Game controls
-st.markdown("### 🎯 Choose Your Weapon!")
+# Matches and tournaments
+match = st.session_state.match
+tournament = st.session_state.tournament
+if st.session_state.match_message:
+    st.success(st.session_state.match_message)
+    st.session_state.match_message = None
 
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    if st.button(f"{CHOICES['Rock']} Rock", key="rock", use_container_width=True):
-        play_round("Rock")
+if match is not None:
+    label = "🏆 Tournament match" if tournament else "⚔️ Match"
+    st.info(f"{label}: **{match.player_a} {match.a_wins} - {match.b_wins} {match.player_b}** "
+            f"(best of {match.best_of}, first to {match.wins_needed} wins)")
+    if st.button("🏳️ Forfeit", help="Leave the match (and tournament) without saving it"):
+        st.session_state.match = st.session_state.match_opponent = st.session_state.tournament = None
         st.rerun()
-
-with col2:
-    if st.button(f"{CHOICES['Paper']} Paper", key="paper", use_container_width=True):
-        play_round("Paper")
+else:
+    # Rule set selection
+    rule_set = st.selectbox("📜 Rules:", list(RULE_SETS), index=list(RULE_SETS).index(rules.name),
+                            help="Changing the rules starts a new game")
+    if rule_set != rules.name:
+        st.session_state.rule_set = rule_set
         st.rerun()
 
-with col3:
-    if st.button(f"{CHOICES['Scissors']} Scissors", key="scissors", use_container_width=True):
-        play_round("Scissors")
-        st.rerun()
+    # Opponent selection
+    st.session_state.opponent = st.radio(
+        "🤖 Opponent:",
+        OPPONENTS,
+        index=OPPONENTS.index(st.session_state.opponent),
+        horizontal=True,
+        help="Adaptive learns your patterns and plays to beat your next throw",
+    )
+    with st.expander("🏟️ Matches & Tournaments", expanded=False):
+        st.session_state.player_name = st.text_input(
+            "Your name:", value=st.session_state.player_name,
+            help="Shown on the leaderboard as 👤 name #id; the id keeps players with the same name apart",
+        ).strip() or 'You'
+        tab_match, tab_tournament = st.tabs(["⚔️ Best-of Match", "🏆 Round Robin"])
+        with tab_match:
+            opponent = st.selectbox("Opponent:", list(PERSONALITIES))
+            best_of = st.select_slider("Best of:", BEST_OF, key="match_best_of")
+            if st.button("⚔️ Start Match"):
+                st.session_state.tournament = None
+                start_match(opponent, best_of)
+                st.rerun()
+        with tab_tournament:
+            entrants = st.multiselect("Computer players:", list(PERSONALITIES), default=list(PERSONALITIES))
+            best_of = st.select_slider("Best of:", BEST_OF, key="tournament_best_of")
+            st.caption("Every player meets every other once; the computers' matches are played instantly.")
+            if st.button("🏆 Start Round Robin", disabled=not entrants):
+                start_tournament(entrants, best_of)
+                st.rerun()
+
+if tournament is not None:
+    with st.expander("🏆 Tournament Standings", expanded=True):
+        st.dataframe(tournament_table(tournament['matches']), hide_index=True, use_container_width=True)
+        if tournament['queue']:
+            st.caption(f"Still to play: {', '.join(tournament['queue'])}")
+
+# Game controls
+st.markdown("### 🎯 Choose Your Weapon!")
+
+per_row = 3 if len(CHOICE_NAMES) <= 3 else 5
+for start in range(0, len(CHOICE_NAMES), per_row):
+    cols = st.columns(per_row)
+    for col, choice in zip(cols, CHOICE_NAMES[start:start + per_row]):
+        with col:
+            if st.button(f"{CHOICES[choice]} {choice}", key=choice.lower(), use_container_width=True):
+                play_round(choice)
+                st.rerun()
 
 # Battle area - show last round results
 if st.session_state.last_result is not None:
@@ -299,10 +433,16 @@ if st.session_state.last_result is not None:
         result_class = "tie"
     
     st.markdown(f'<div class="result-text {result_class}">{result_text}</div>', unsafe_allow_html=True)
+    if st.session_state.last_result != "tie":
+        player, computer = st.session_state.player_choice, st.session_state.computer_choice
+        winner, loser = (player, computer) if st.session_state.last_result == "win" else (computer, player)
+        st.markdown(f"<div style='text-align: center;'>{CHOICES[winner]} {winner} {rules.verb(winner, loser)} {loser} {CHOICES[loser]}</div>",
+                    unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
 # Game statistics
 if st.session_state.total_games > 0:
+    stats = st.session_state.stats
     win_rate = get_win_percentage()
     
     st.markdown(f"""
@@ -310,18 +450,57 @@ if st.session_state.total_games > 0:
         <h3>📊 Game Statistics</h3>
         <div style="display: flex; justify-content: space-around; margin: 1rem 0;">
             <div><strong>Win Rate:</strong> {win_rate:.1f}%</div>
-            <div><strong>Best Streak:</strong> Coming Soon!</div>
+            <div><strong>Last {stats.window}:</strong> {stats.rolling_win_rate():.1f}%</div>
+            <div><strong>Current Streak:</strong> {streak_text(*stats.current_streak())}</div>
+        </div>
+        <div style="display: flex; justify-content: space-around; margin: 1rem 0;">
+            <div><strong>Best Streak:</strong> {streak_text('win', stats.best_win_streak)}</div>
+            <div><strong>Worst Streak:</strong> {streak_text('lose', stats.best_loss_streak)}</div>
         </div>
     </div>
     """, unsafe_allow_html=True)
+
+    with st.expander("🎯 How Each Throw Did", expanded=False):
+        window = st.select_slider("Rolling win rate over the last", ROLLING_WINDOWS, value=stats.window,
+                                  format_func=lambda n: f"{n} rounds")
+        if window != stats.window:
+            results = st.session_state.game_history.result[-window:]
+            stats.set_window(window, [RESULTS[r] for r in results])
+            st.rerun()
+        rows = []
+        for choice, outcomes in st.session_state.game_history.choice_outcomes().items():
+            played = sum(outcomes.values())
+            rows.append({
+                "Throw": f"{CHOICES[choice]} {choice}",
+                "Played": played,
+                "Won %": round(outcomes['win'] / played * 100, 1) if played else 0.0,
+                "Lost %": round(outcomes['lose'] / played * 100, 1) if played else 0.0,
+                "Tied %": round(outcomes['tie'] / played * 100, 1) if played else 0.0,
+            })
+        st.dataframe(rows, hide_index=True, use_container_width=True)
     
     # Game history
-    if st.session_state.game_history:
+    if len(st.session_state.game_history):
         with st.expander("📜 Recent Game History", expanded=False):
-            for game in reversed(st.session_state.game_history[-5:]):  # Show last 5 games
+            for game in reversed(st.session_state.game_history.recent(5)):  # Show last 5 games
                 result_emoji = "🏆" if game['result'] == 'win' else "❌" if game['result'] == 'lose' else "🤝"
                 st.write(f"Round {game['round']}: You ({CHOICES[game['player']]}) vs Computer ({CHOICES[game['computer']]}) {result_emoji}")
 
+# Leaderboard
+with st.expander("🥇 Leaderboard", expanded=False):
+    top = leaderboard.leaderboard(10)
+    if top:
+        st.dataframe(top, hide_index=True, use_container_width=True)
+        player_id, name = human_player(st.session_state.player_id, st.session_state.player_name)
+        recent = leaderboard.recent_matches(player_id, 5)
+        if recent:
+            st.markdown(f"**{name}'s recent matches**")
+            for m in recent:
+                st.write(f"{m['player_a']} {m['a_wins']} - {m['b_wins']} {m['player_b']} "
+                         f"(best of {m['best_of']}) {'🏆 ' + m['winner'] if m['winner'] else '🤝 Draw'}")
+    else:
+        st.write("No matches played yet. Start a match or a round robin above!")
+
 # Control buttons
 col1, col2 = st.columns(2)
 
@@ -340,21 +519,31 @@ st.markdown('</div>', unsafe_allow_html=True)
 
 # Game rules
 with st.expander("📋 Game Rules", expanded=False):
-    st.markdown("""
-    ### How to Play:
-    - **Rock** 🪨 beats **Scissors** ✂️
-    - **Scissors** ✂️ beats **Paper** 📄  
-    - **Paper** 📄 beats **Rock** 🪨
+    how_to_play = "\n".join(
+        f"    - **{winner}** {CHOICES[winner]} "
+        + ", ".join(f"{rules.verb(winner, loser)} **{loser}** {CHOICES[loser]}" for loser in rules.beats[winner])
+        for winner in CHOICE_NAMES
+    )
+    st.markdown(f"""
+    ### How to Play ({rules.name}):
+{how_to_play}
     
     ### Scoring:
     - Win: +1 point to your score
     - Lose: +1 point to computer's score
     - Tie: +1 to tie count
+
+    ### Matches & Tournaments:
+    - **Best-of match:** first to win most of N rounds (ties are replayed) against a computer personality
+    - **Round robin:** you and the chosen computers all play each other once
+    - Match wins earn 3 points on the leaderboard (a draw between computers earns 1)
     
     ### Tips:
-    - 🎯 Try to identify patterns (though the computer is random!)
+    - 🎯 The Random opponent has no patterns to find, but the Adaptive one is looking for yours
+    - 🧠 Against Adaptive, mix up your throws - repeating or cycling gets punished fast
     - 🏆 Aim for a high win percentage
     - 🔄 Use reset to start fresh anytime
+    - 📜 More rule sets can be added to day13_rules.json
     """)
 
 # Fun facts
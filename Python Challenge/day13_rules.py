@@ -0,0 +1,99 @@
+"""Rule sets for rock-paper-scissors and its bigger cousins.
+
+A rule set has an odd number of throws and every throw beats exactly half
+of the others, like Rock Paper Scissors Lizard Spock or RPS-15. The rules are
+turned into an N x N outcome table once, so settling a round is one lookup
+however many throws there are.
+
+Rule sets are read from JSON (see day13_rules.json). Each one lists its
+throws with emojis and either a "cycle" (each throw beats the (N - 1) / 2
+throws after it, wrapping around) or an explicit "beats" map; "verbs" are
+optional ("Rock": {"Scissors": "crushes"}).
+"""
+import json
+import os
+import numpy as np
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "day13_rules.json")
+
+
+class RuleSet:
+    """Throws, who beats whom and the precomputed outcome table"""
+
+    def __init__(self, name, choices, beats, verbs=None):
+        self.name = name
+        self.emojis = dict(choices)  # throw -> emoji, in display order
+        self.names = list(self.emojis)
+        self.verbs = verbs or {}
+        n = len(self.names)
+        if n < 3 or n % 2 == 0:
+            raise ValueError(f"{name}: needs an odd number of throws (3 or more), got {n}")
+        for winner, losers in beats.items():
+            for throw in [winner, *losers]:
+                if throw not in self.emojis:
+                    raise ValueError(f"{name}: unknown throw {throw!r}")
+        self.beats = {throw: list(beats.get(throw, [])) for throw in self.names}
+        for throw, losers in self.beats.items():
+            if len(set(losers)) != (n - 1) // 2 or throw in losers:
+                raise ValueError(f"{name}: {throw} must beat exactly {(n - 1) // 2} other throws")
+        for a in self.names:
+            for b in self.beats[a]:
+                if a in self.beats[b]:
+                    raise ValueError(f"{name}: {a} and {b} both beat each other")
+
+        self.index = {throw: i for i, throw in enumerate(self.names)}
+        # outcomes[i, j]: +1 if throw i beats throw j, -1 if it loses, 0 for the same throw
+        self.outcomes = np.zeros((n, n), dtype=np.int8)
+        for a, losers in self.beats.items():
+            for b in losers:
+                self.outcomes[self.index[a], self.index[b]] = 1
+                self.outcomes[self.index[b], self.index[a]] = -1
+        labels = {1: "win", -1: "lose", 0: "tie"}
+        self._results = {
+            (a, b): labels[int(self.outcomes[i, j])]
+            for a, i in self.index.items() for b, j in self.index.items()
+        }
+        # A throw that beats each throw (the first in display order), for counter-play
+        self.counters = {b: next(a for a in self.names if b in self.beats[a]) for b in self.names}
+
+    @classmethod
+    def from_cycle(cls, name, choices, cycle, verbs=None):
+        """Each throw in `cycle` beats the (N - 1) / 2 throws that follow it"""
+        n = len(cycle)
+        half = (n - 1) // 2
+        beats = {throw: [cycle[(i + k) % n] for k in range(1, half + 1)] for i, throw in enumerate(cycle)}
+        return cls(name, choices, beats, verbs)
+
+    @classmethod
+    def from_dict(cls, data):
+        choices = {c["name"]: c.get("emoji", "") for c in data["choices"]}
+        if "cycle" in data:
+            return cls.from_cycle(data["name"], choices, data["cycle"], data.get("verbs"))
+        return cls(data["name"], choices, data["beats"], data.get("verbs"))
+
+    def result(self, player, computer):
+        """'win', 'lose' or 'tie' for the player, one dict lookup"""
+        return self._results[(player, computer)]
+
+    def verb(self, winner, loser):
+        return self.verbs.get(winner, {}).get(loser, "beats")
+
+
+def load_rule_sets(path=DEFAULT_RULES_PATH):
+    """{name: RuleSet} from a JSON file holding {"rule_sets": [...]}, in file order"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    rule_sets = {}
+    for entry in data["rule_sets"]:
+        rules = RuleSet.from_dict(entry)
+        rule_sets[rules.name] = rules
+    return rule_sets
+
+
+# The classic game, built in so callers work without a rules file
+CLASSIC = RuleSet.from_cycle(
+    "Rock Paper Scissors",
+    {"Rock": "🪨", "Paper": "📄", "Scissors": "✂️"},
+    ["Rock", "Scissors", "Paper"],
+    {"Rock": {"Scissors": "crushes"}, "Scissors": {"Paper": "cuts"}, "Paper": {"Rock": "covers"}},
+)
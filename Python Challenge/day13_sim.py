@@ -0,0 +1,172 @@
+"""Headless Monte Carlo simulator for rock-paper-scissors strategies.
+
+    python day13_sim.py run random biased --rounds 10000000
+    python day13_sim.py run cycle adaptive --rounds 100000
+    python day13_sim.py run random adaptive --rule-set RPS-15 --rounds 100000
+    python day13_sim.py bench --rounds 1000000
+
+Throws are integer indexes into a rule set's throws and winners come from its
+outcome table (see day13_rules): outcomes[a, b] is +1 when a beats b, -1 when
+it loses and 0 for a tie, so a whole chunk of rounds is resolved with one
+fancy-indexing lookup. Rounds are played in chunks to keep memory flat
+however many are asked for.
+"""
+import argparse
+import math
+import random
+import time
+import numpy as np
+from day13_ai import AdaptiveOpponent
+from day13_rules import CLASSIC, DEFAULT_RULES_PATH, load_rule_sets
+
+CHUNK_SIZE = 1_000_000
+
+
+# ----------------- STRATEGIES -----------------
+# Vectorized strategies: function(rng, start, count, n) -> array of `count` throws
+# for rounds start .. start + count - 1. Register new ones in STRATEGIES.
+def random_throws(rng, start, count, n):
+    return rng.integers(0, n, count, dtype=np.int8)
+
+
+def rock_throws(rng, start, count, n):
+    return np.zeros(count, dtype=np.int8)
+
+
+def biased_throws(rng, start, count, n):
+    """Favourite throw (the first) half the time, otherwise random"""
+    p = np.full(n, 0.5 / (n - 1))
+    p[0] = 0.5
+    return rng.choice(n, count, p=p).astype(np.int8)
+
+
+def cycle_throws(rng, start, count, n):
+    return (np.arange(start, start + count) % n).astype(np.int8)
+
+
+STRATEGIES = {
+    "random": random_throws,
+    "rock": rock_throws,
+    "biased": biased_throws,
+    "cycle": cycle_throws,
+}
+# Opponents that learn from each round can't be vectorized; they play round by round
+ADAPTIVE_STRATEGIES = {
+    "adaptive": lambda rules, rng: AdaptiveOpponent(rules.names, rules.counters, rng=rng),
+}
+
+
+# ----------------- SIMULATION -----------------
+def wilson_interval(successes, trials, z=1.96):
+    """95% (by default) Wilson score interval for a proportion"""
+    if not trials:
+        return 0.0, 0.0
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return centre - half, centre + half
+
+
+def simulate(first, second, rounds, seed=0, chunk_size=CHUNK_SIZE, rules=CLASSIC):
+    """Play `rounds` rounds of two vectorized strategies; returns {'win', 'lose', 'tie'} counts for `first`"""
+    rng = np.random.default_rng(seed)
+    outcomes = rules.outcomes
+    n = len(outcomes)
+    counts = np.zeros(3, dtype=np.int64)
+    for start in range(0, rounds, chunk_size):
+        count = min(chunk_size, rounds - start)
+        a = STRATEGIES[first](rng, start, count, n)
+        b = STRATEGIES[second](rng, start, count, n)
+        # outcome -1/0/+1 -> bins 0/1/2
+        counts += np.bincount(outcomes[a, b] + 1, minlength=3)
+    return {'win': int(counts[2]), 'lose': int(counts[0]), 'tie': int(counts[1])}
+
+
+def simulate_adaptive(first, second, rounds, seed=0, chunk_size=CHUNK_SIZE, rules=CLASSIC):
+    """Like simulate(), but `second` is an adaptive opponent that sees each of `first`'s throws
+
+    `first` still draws its throws a chunk at a time; the opponent answers round by round.
+    """
+    rng = np.random.default_rng(seed)
+    opponent = ADAPTIVE_STRATEGIES[second](rules, random.Random(seed))
+    outcomes = rules.outcomes
+    n = len(outcomes)
+    counts = [0, 0, 0]
+    for start in range(0, rounds, chunk_size):
+        for throw in STRATEGIES[first](rng, start, min(chunk_size, rounds - start), n).tolist():
+            reply = rules.index[opponent.choose()]
+            counts[outcomes[throw, reply] + 1] += 1
+            opponent.observe(rules.names[throw])
+    return {'win': counts[2], 'lose': counts[0], 'tie': counts[1]}
+
+
+def report(first, second, counts, seconds, rules=CLASSIC):
+    rounds = sum(counts.values())
+    print(f"{rounds:,} rounds of {first} vs {second}, {rules.name} ({rounds / seconds:,.0f} rounds/s)")
+    for result in ('win', 'lose', 'tie'):
+        low, high = wilson_interval(counts[result], rounds)
+        print(f"  {first} {result:4s} {counts[result] / rounds:7.3%}   95% CI {low:7.3%} - {high:7.3%}")
+
+
+# ----------------- BENCHMARK -----------------
+def chained_winner(player, computer):
+    """The original if/elif winner check, kept here as the baseline"""
+    if player == computer:
+        return "tie"
+    elif (player == "Rock" and computer == "Scissors") or \
+         (player == "Paper" and computer == "Rock") or \
+         (player == "Scissors" and computer == "Paper"):
+        return "win"
+    else:
+        return "lose"
+
+
+def bench(rounds):
+    python_rounds = min(rounds, 1_000_000)
+    start = time.perf_counter()
+    counts = {'win': 0, 'lose': 0, 'tie': 0}
+    for _ in range(python_rounds):
+        counts[chained_winner(random.choice(CLASSIC.names), random.choice(CLASSIC.names))] += 1
+    python_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    simulate("random", "random", rounds)
+    numpy_s = time.perf_counter() - start
+
+    print("random vs random, win check + throws per round")
+    print(f"  per-round Python: {python_rounds / python_s:14,.0f} rounds/s (on {python_rounds:,})")
+    print(f"  vectorized NumPy: {rounds / numpy_s:14,.0f} rounds/s (on {rounds:,})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="day13 rock-paper-scissors simulator")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="play two strategies against each other")
+    run.add_argument("first", choices=list(STRATEGIES))
+    run.add_argument("second", choices=list(STRATEGIES) + list(ADAPTIVE_STRATEGIES))
+    run.add_argument("--rounds", type=int, default=1_000_000)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--rules", default=DEFAULT_RULES_PATH, help="JSON file of rule sets")
+    run.add_argument("--rule-set", default=CLASSIC.name, help="name of the rule set to play")
+    timing = sub.add_parser("bench", help="per-round Python vs vectorized throughput")
+    timing.add_argument("--rounds", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        rule_sets = load_rule_sets(args.rules)
+        if args.rule_set not in rule_sets:
+            parser.error(f"no rule set {args.rule_set!r} in {args.rules} (have: {', '.join(rule_sets)})")
+        rules = rule_sets[args.rule_set]
+        start = time.perf_counter()
+        if args.second in ADAPTIVE_STRATEGIES:
+            counts = simulate_adaptive(args.first, args.second, args.rounds, args.seed, rules=rules)
+        else:
+            counts = simulate(args.first, args.second, args.rounds, args.seed, rules=rules)
+        report(args.first, args.second, counts, time.perf_counter() - start, rules)
+    elif args.command == "bench":
+        bench(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
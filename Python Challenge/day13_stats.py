@@ -0,0 +1,64 @@
+"""Running statistics for rock-paper-scissors rounds.
+
+Everything is updated as each round is recorded, so reading the stats on a
+rerun never walks the history: totals, current and best win/loss streaks,
+and the win rate over the last `window` rounds (a deque plus a running win
+count). A tie ends whichever streak was going.
+"""
+from collections import deque
+
+ROLLING_WINDOW = 20
+
+
+class RoundStats:
+    """Totals, streaks and rolling win rate, O(1) per round"""
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.totals = {'win': 0, 'lose': 0, 'tie': 0}
+        self.rounds = 0
+        self.streak_result = None  # 'win' or 'lose' while a streak is running
+        self.streak = 0
+        self.best_win_streak = 0
+        self.best_loss_streak = 0
+        self.window = window
+        self._window_results = deque(maxlen=window)
+        self._window_wins = 0
+
+    def record(self, result):
+        """Add one round's result ('win', 'lose' or 'tie')"""
+        self.totals[result] += 1
+        self.rounds += 1
+
+        if result == 'tie':
+            self.streak_result, self.streak = None, 0
+        elif result == self.streak_result:
+            self.streak += 1
+        else:
+            self.streak_result, self.streak = result, 1
+        if result == 'win':
+            self.best_win_streak = max(self.best_win_streak, self.streak)
+        elif result == 'lose':
+            self.best_loss_streak = max(self.best_loss_streak, self.streak)
+
+        if len(self._window_results) == self.window and self._window_results[0] == 'win':
+            self._window_wins -= 1  # about to drop off the window
+        self._window_results.append(result)
+        self._window_wins += result == 'win'
+
+    def set_window(self, window, recent_results):
+        """Change the rolling window; `recent_results` are the latest results, oldest first"""
+        self.window = window
+        self._window_results = deque(recent_results[-window:] if window else [], maxlen=window)
+        self._window_wins = sum(result == 'win' for result in self._window_results)
+
+    def win_rate(self):
+        """Percentage of all rounds won"""
+        return self.totals['win'] / self.rounds * 100 if self.rounds else 0
+
+    def rolling_win_rate(self):
+        """Percentage of the last `window` rounds won (fewer at the start)"""
+        return self._window_wins / len(self._window_results) * 100 if self._window_results else 0
+
+    def current_streak(self):
+        """(result, length) of the streak still going, or (None, 0)"""
+        return self.streak_result, self.streak
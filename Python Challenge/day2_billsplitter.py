@@ -1,4 +1,5 @@
 import streamlit as st
+from money import format_money, split_evenly, to_cents
 
 st.title("🍽️ Bill Splitter App")
 
@@ -35,17 +36,21 @@ if st.button("💰 Calculate Split"):
     elif num_people <= 0:
         st.warning("⚠️ Please enter a valid number of people.")
     else:
-        fair_share = total_amount / num_people
+        # Work in sen so the shares always add up to the bill exactly
+        shares = split_evenly(to_cents(total_amount), int(num_people))
         st.subheader("📊 Results")
-        st.write(f"Each person should ideally pay: **RM {fair_share:.2f}**")
+        st.write(f"Each person should ideally pay: **{format_money(shares[-1], 'RM ')}**")
+        if shares[0] != shares[-1]:
+            extra = shares.count(shares[0])
+            st.caption(f"The bill doesn't split evenly, so the first {extra} person(s) pay 1 sen more.")
 
         results = []
-        for name, contrib in zip(names, contributions):
-            balance = contrib - fair_share
+        for name, contrib, share in zip(names, contributions, shares):
+            balance = to_cents(contrib) - share
             if balance > 0:
-                results.append(f"✅ {name} should get back **RM {balance:.2f}**")
+                results.append(f"✅ {name} should get back **{format_money(balance, 'RM ')}**")
             elif balance < 0:
-                results.append(f"❌ {name} should pay **RM {abs(balance):.2f}** more")
+                results.append(f"❌ {name} should pay **{format_money(-balance, 'RM ')}** more")
             else:
                 results.append(f"👌 {name} is settled.")
 
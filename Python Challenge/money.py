@@ -0,0 +1,63 @@
+"""Exact money arithmetic shared by the billing apps.
+
+Amounts are kept as integer minor units (cents / sen). Converting from a
+float goes through its shortest decimal string, so 8.5 becomes exactly 850
+and 0.1 + 0.2 style drift never enters the totals.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
+
+
+# ----------------- SCALARS -----------------
+def to_cents(amount):
+    """Amount (float, int, str or Decimal) -> integer cents, rounding half up"""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents):
+    """Integer cents -> Decimal with two places (exact, safe to format or sum)"""
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def format_money(cents, symbol="$"):
+    """Format cents as e.g. '$1,234.50' or '-RM 3.00'"""
+    sign = "-" if cents < 0 else ""
+    return f"{sign}{symbol}{from_cents(abs(cents)):,.2f}"
+
+
+def apply_rate(cents, rate):
+    """cents * rate (e.g. a tax rate), rounded half up to whole cents"""
+    return int((Decimal(int(cents)) * Decimal(str(rate))).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def split_evenly(total_cents, parts):
+    """Split cents into `parts` shares that differ by at most one cent and add up exactly"""
+    base, remainder = divmod(int(total_cents), int(parts))
+    return [base + 1] * remainder + [base] * (parts - remainder)
+
+
+# ----------------- VECTORIZED -----------------
+def to_cents_array(amounts):
+    """Array of amounts -> int64 cents (half up), for prices with at most a few decimals"""
+    amounts = np.asarray(amounts, dtype=np.float64)
+    # The tiny nudge makes values like 1.005 (stored as 1.00499999...) round up like to_cents does
+    return (np.sign(amounts) * np.floor(np.abs(amounts) * 100 + 0.5 + 1e-9)).astype(np.int64)
+
+
+def line_totals(quantities, unit_cents):
+    """Element-wise quantity * unit price in cents (int64, no rounding involved)"""
+    return np.asarray(quantities, dtype=np.int64) * np.asarray(unit_cents, dtype=np.int64)
+
+
+def total_cents(values):
+    """Exact sum of an array of cents"""
+    return int(np.sum(np.asarray(values, dtype=np.int64), dtype=np.int64))
+
+
+def group_totals(keys, values):
+    """Sum cents per key, returns {key: cents}"""
+    uniques, inverse = np.unique(np.asarray(keys), return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    starts = np.searchsorted(inverse[order], np.arange(len(uniques)))
+    sums = np.add.reduceat(np.asarray(values, dtype=np.int64)[order], starts) if len(order) else []
+    return {key: int(total) for key, total in zip(uniques.tolist(), sums)}